@@ -6,18 +6,92 @@
 import sqlite3
 import json
 import hashlib
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set, Tuple
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# sync_with_bos 并发查询BOS的线程数
+BOS_CHECK_MAX_WORKERS = 32
+
+# 大批量写入时使用的 PRAGMA（journal_mode=WAL 会持久化到数据库文件）
+_BULK_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+# 高频写入语句定义为常量：SQL文本不变，同一连接上可直接命中 sqlite3 的语句缓存
+_ADD_SCENE_SQL = """
+    INSERT INTO scenes (scene_name, bos_baked_path, local_path, content_hash, 
+                       bos_exists, bos_last_verified, downloaded_at, last_updated, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(scene_name) DO UPDATE SET
+        bos_baked_path = excluded.bos_baked_path,
+        local_path = excluded.local_path,
+        content_hash = excluded.content_hash,
+        bos_exists = excluded.bos_exists,
+        bos_last_verified = excluded.bos_last_verified,
+        last_updated = excluded.last_updated,
+        metadata = excluded.metadata
+"""
+
+_ADD_BAKED_SCENE_SQL = """
+    INSERT INTO scenes (scene_name, bos_baked_path, content_hash,
+                       bos_exists, bos_last_verified, last_updated)
+    VALUES (?, ?, '', 1, ?, ?)
+    ON CONFLICT(scene_name) DO UPDATE SET
+        bos_baked_path = excluded.bos_baked_path,
+        bos_exists = excluded.bos_exists,
+        bos_last_verified = excluded.bos_last_verified,
+        last_updated = excluded.last_updated
+"""
+
+# 每个连接的预编译语句缓存容量
+_CACHED_STATEMENTS = 256
 
 
 class SceneRegistry:
+    # instance() 缓存的实例: {数据库绝对路径: SceneRegistry}
+    _instances: Dict[str, "SceneRegistry"] = {}
+    _instances_lock = threading.Lock()
+    
     def __init__(self, db_path: str = "database/scene_registry.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # transaction() 期间共享的连接按线程保存：实例由 instance() 在进程内共享，
+        # 一个线程的事务不能把其他线程（如 sync_with_bos 的工作线程）的读写带进自己的连接
+        self._tx_local = threading.local()
         self._init_database()
     
+    @property
+    def _tx_conn(self):
+        """当前线程 transaction() 中的连接，不在事务中时为 None"""
+        return getattr(self._tx_local, "conn", None)
+    
+    @_tx_conn.setter
+    def _tx_conn(self, conn):
+        self._tx_local.conn = conn
+    
+    @classmethod
+    def instance(cls, db_path: str = "database/scene_registry.db") -> "SceneRegistry":
+        """
+        获取进程内共享的注册表实例
+        
+        同一数据库文件只初始化一次（建表/迁移检查只执行一次），
+        流水线中的多个步骤共用同一实例。
+        """
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            registry = cls._instances.get(key)
+            if registry is None:
+                registry = cls(db_path)
+                cls._instances[key] = registry
+            return registry
+    
     def _init_database(self):
         """初始化数据库表结构"""
         with self._get_connection() as conn:
@@ -187,14 +261,59 @@ class SceneRegistry:
     
     @contextmanager
     def _get_connection(self):
-        """获取数据库连接的上下文管理器"""
-        conn = sqlite3.connect(self.db_path)
+        """获取数据库连接的上下文管理器（处于 transaction() 中时复用事务连接）"""
+        if self._tx_conn is not None:
+            yield self._tx_conn
+            return
+        
+        conn = sqlite3.connect(self.db_path, cached_statements=_CACHED_STATEMENTS)
         conn.row_factory = sqlite3.Row  # 允许字典式访问
         try:
             yield conn
         finally:
             conn.close()
     
+    def _commit(self, conn):
+        """提交写操作；处于 transaction() 中时推迟到事务结束统一提交"""
+        if conn is not self._tx_conn:
+            conn.commit()
+    
+    @contextmanager
+    def transaction(self, fast_bulk: bool = False):
+        """
+        批量写入的事务上下文
+        
+        块内的所有写操作共用一个连接，退出时只提交一次（每次提交都会触发fsync）；
+        块内抛出异常时整体回滚。
+        
+        Args:
+            fast_bulk: 为大批量写入调整 PRAGMA（WAL + synchronous=NORMAL 等），
+                       仅用于一次性同步等写密集场景
+        
+        Example:
+            with registry.transaction():
+                for name in scenes:
+                    registry.add_scene(name, ...)
+        """
+        if self._tx_conn is not None:
+            # 嵌套事务并入外层事务
+            yield self
+            return
+        
+        with self._get_connection() as conn:
+            if fast_bulk:
+                for pragma in _BULK_PRAGMAS:
+                    conn.execute(pragma)
+            self._tx_conn = conn
+            try:
+                yield self
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._tx_conn = None
+    
     # ==================== Scene Operations ====================
     
     def add_scene(self, scene_name: str, bos_baked_path: str, 
@@ -221,23 +340,30 @@ class SceneRegistry:
         with self._get_connection() as conn:
             now = datetime.utcnow().isoformat()
             downloaded_at = now if is_downloaded else None
-            conn.execute("""
-                INSERT INTO scenes (scene_name, bos_baked_path, local_path, content_hash, 
-                                   bos_exists, bos_last_verified, downloaded_at, last_updated, metadata)
-                ON CONFLICT(scene_name) DO UPDATE SET
-                    bos_baked_path = excluded.bos_baked_path,
-                    local_path = excluded.local_path,
-                    content_hash = excluded.content_hash,
-                    bos_exists = excluded.bos_exists,
-                    bos_last_verified = excluded.bos_last_verified,
-                    last_updated = excluded.last_updated,
-                    metadata = excluded.metadata
-            """, (scene_name, bos_baked_path, local_path, content_hash, 
+            conn.execute(_ADD_SCENE_SQL, (scene_name, bos_baked_path, local_path, content_hash, 
                   bos_exists, now if bos_exists else None,
                   downloaded_at, now, json.dumps(metadata) if metadata else None))
-            conn.commit()
+            self._commit(conn)
             return True
     
+    def add_baked_scenes(self, scenes: List[Tuple[str, str]]) -> int:
+        """
+        批量登记BOS上已存在的烘焙场景（单条 executemany，一次提交）
+        
+        新场景直接插入；已有场景只更新BOS路径和存在状态，保留本地路径、哈希等字段。
+        
+        Args:
+            scenes: [(场景名称, BOS烘焙路径), ...]
+        
+        Returns:
+            写入的记录数
+        """
+        now = datetime.utcnow().isoformat()
+        with self._get_connection() as conn:
+            conn.executemany(_ADD_BAKED_SCENE_SQL, [(scene_name, bos_baked_path, now, now) for scene_name, bos_baked_path in scenes])
+            self._commit(conn)
+        return len(scenes)
+    
     def get_scene(self, scene_name: str) -> Optional[Dict]:
         with self._get_connection() as conn:
             row = conn.execute(
@@ -251,6 +377,11 @@ class SceneRegistry:
                 return result
             return None
     
+    def get_scene_names(self) -> Set[str]:
+        """一次查询返回所有场景名称（批量判断新增/更新时避免逐个 get_scene）"""
+        with self._get_connection() as conn:
+            return {row[0] for row in conn.execute("SELECT scene_name FROM scenes")}
+    
     def is_scene_downloaded(self, scene_name: str, expected_hash: Optional[str] = None) -> bool:
         scene = self.get_scene(scene_name)
         if not scene or not scene['downloaded_at']:
@@ -268,7 +399,7 @@ class SceneRegistry:
                 SET file_count = ?, total_size_bytes = ?, last_updated = ?
                 WHERE scene_name = ?
             """, (file_count, total_size_bytes, datetime.utcnow().isoformat(), scene_name))
-            conn.commit()
+            self._commit(conn)
     
     def list_scenes(self, downloaded_only: bool = False) -> List[Dict]:
         with self._get_connection() as conn:
@@ -294,7 +425,7 @@ class SceneRegistry:
             conn.execute("DELETE FROM maps WHERE scene_name = ?", (scene_name,))
             # 删除场景
             cursor = conn.execute("DELETE FROM scenes WHERE scene_name = ?", (scene_name,))
-            conn.commit()
+            self._commit(conn)
             return cursor.rowcount > 0
     
     # ==================== Map Operations ====================
@@ -310,7 +441,7 @@ class SceneRegistry:
                     map_path = excluded.map_path,
                     metadata = excluded.metadata
             """, (scene_name, map_name, map_path, json.dumps(metadata) if metadata else None))
-            conn.commit()
+            self._commit(conn)
             return True
     
     def update_navmesh_status(self, scene_name: str, map_name: str,
@@ -329,7 +460,7 @@ class SceneRegistry:
                 WHERE scene_name = ? AND map_name = ?
             """, (navmesh_hash, datetime.utcnow().isoformat(), auto_scale,
                   json.dumps(bounds) if bounds else None, scene_name, map_name))
-            conn.commit()
+            self._commit(conn)
     
     def is_navmesh_baked(self, scene_name: str, map_name: str, 
                         expected_hash: Optional[str] = None) -> bool:
@@ -400,7 +531,7 @@ class SceneRegistry:
                     metadata = excluded.metadata
             """, (scene_name, map_name, sequence_name, sequence_path, 
                   seed, duration_seconds, bos_path, now, json.dumps(metadata) if metadata else None))
-            conn.commit()
+            self._commit(conn)
             return True
     
     def mark_sequence_uploaded(self, scene_name: str, map_name: str, 
@@ -412,7 +543,7 @@ class SceneRegistry:
                 SET bos_path = ?, uploaded_at = ?
                 WHERE scene_name = ? AND map_name = ? AND sequence_name = ?
             """, (bos_path, datetime.utcnow().isoformat(), scene_name, map_name, sequence_name))
-            conn.commit()
+            self._commit(conn)
     
     def list_sequences(self, scene_name: Optional[str] = None,
                       map_name: Optional[str] = None,
@@ -461,18 +592,21 @@ class SceneRegistry:
                 SET bos_exists = ?, bos_last_verified = ?, last_updated = ?
                 WHERE scene_name = ?
             """, (exists, now, now, scene_name))
-            conn.commit()
+            self._commit(conn)
     
-    def sync_with_bos(self, bos_client, bucket: str = "world-data", prefix: str = "baked/"):
+    def sync_with_bos(self, bos_client, bucket: str = "world-data", prefix: str = "baked/",
+                      max_workers: int = BOS_CHECK_MAX_WORKERS):
         """
         同步数据库与BOS状态
         
-        检查数据库中记录的所有场景，验证它们在BOS中是否仍然存在
+        检查数据库中记录的所有场景，验证它们在BOS中是否仍然存在。
+        BOS查询纯属网络等待，用线程池并发执行；数据库写入在当前线程的单个事务中完成。
         
         Args:
             bos_client: BOS客户端实例（bce-python-sdk的BosClient）
             bucket: BOS bucket名称
             prefix: 前缀路径（如 "baked/"）
+            max_workers: 并发查询数
         
         Returns:
             Dict: 同步结果统计
@@ -490,57 +624,65 @@ class SceneRegistry:
         # 获取数据库中的所有场景
         scenes = self.list_scenes()
         
-        for scene in scenes:
+        def check_exists(scene) -> bool:
+            # 构建BOS路径（从bos_baked_path提取）
+            # 例如: "bos://world-data/baked/Seaside_Town/" -> "baked/Seaside_Town/"
             scene_name = scene['scene_name']
-            old_status = scene['bos_exists']
-            
-            try:
-                # 构建BOS路径（从bos_baked_path提取）
-                # 例如: "bos://world-data/baked/Seaside_Town/" -> "baked/Seaside_Town/"
-                bos_path = scene['bos_baked_path']
-                if bos_path.startswith('bos://'):
-                    path_parts = bos_path.replace('bos://', '').split('/', 1)
-                    if len(path_parts) > 1:
-                        object_prefix = path_parts[1].rstrip('/')
-                    else:
-                        object_prefix = f"{prefix}{scene_name}"
+            bos_path = scene['bos_baked_path']
+            if bos_path.startswith('bos://'):
+                path_parts = bos_path.replace('bos://', '').split('/', 1)
+                if len(path_parts) > 1:
+                    object_prefix = path_parts[1].rstrip('/')
                 else:
                     object_prefix = f"{prefix}{scene_name}"
-                
-                # 检查BOS中是否存在该路径下的文件
-                # 列出前几个对象即可（不需要全部列出）
-                response = bos_client.list_objects(
-                    bucket_name=bucket,
-                    prefix=object_prefix,
-                    max_keys=1
-                )
-                
-                # 如果有内容，说明场景存在
-                exists = len(response.contents) > 0
-                
-                # 更新状态
-                if exists != old_status:
-                    self.mark_scene_bos_status(scene_name, exists)
-                    stats['updated'] += 1
+            else:
+                object_prefix = f"{prefix}{scene_name}"
+            
+            # 检查BOS中是否存在该路径下的文件
+            # 列出前几个对象即可（不需要全部列出）
+            response = bos_client.list_objects(
+                bucket_name=bucket,
+                prefix=object_prefix,
+                max_keys=1
+            )
+            
+            # 如果有内容，说明场景存在
+            return len(response.contents) > 0
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(scene, executor.submit(check_exists, scene)) for scene in scenes]
+            
+            with self.transaction():
+                for scene, future in futures:
+                    scene_name = scene['scene_name']
+                    old_status = scene['bos_exists']
                     
-                    if not exists:
-                        stats['missing'] += 1
-                        print(f"⚠ 场景 '{scene_name}' 在BOS中已丢失")
-                    else:
-                        print(f"✓ 场景 '{scene_name}' 在BOS中已恢复")
-                else:
-                    if exists:
-                        self.mark_scene_bos_status(scene_name, True)  # 更新验证时间
-                        stats['verified'] += 1
+                    try:
+                        exists = future.result()
+                    except Exception as e:
+                        stats['errors'].append({
+                            'scene': scene_name,
+                            'error': str(e)
+                        })
+                        print(f"✗ 检查场景 '{scene_name}' 时出错: {e}")
+                        continue
+                    
+                    # 更新状态
+                    if exists != old_status:
+                        self.mark_scene_bos_status(scene_name, exists)
+                        stats['updated'] += 1
+                        
+                        if not exists:
+                            stats['missing'] += 1
+                            print(f"⚠ 场景 '{scene_name}' 在BOS中已丢失")
+                        else:
+                            print(f"✓ 场景 '{scene_name}' 在BOS中已恢复")
                     else:
-                        stats['missing'] += 1
-                
-            except Exception as e:
-                stats['errors'].append({
-                    'scene': scene_name,
-                    'error': str(e)
-                })
-                print(f"✗ 检查场景 '{scene_name}' 时出错: {e}")
+                        if exists:
+                            self.mark_scene_bos_status(scene_name, True)  # 更新验证时间
+                            stats['verified'] += 1
+                        else:
+                            stats['missing'] += 1
         
         return stats
     
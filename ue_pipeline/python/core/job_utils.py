@@ -1,16 +1,89 @@
+import argparse
+import mmap
 import os
 import json
+import re
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from .logger import logger
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _LOADS_ACCEPTS_BUFFER = True  # orjson parses a memoryview without copying it
+
+    def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+except ImportError:
+    _json_loads = json.loads
+    _LOADS_ACCEPTS_BUFFER = False
+
+    def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+# Below this size the mmap setup costs more than the read copy it saves
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def read_json_file(path) -> Any:
+    """Parse a JSON file, using orjson when it is installed (C parser, several times faster).
+    
+    Large files are memory-mapped and handed to orjson as a buffer, so the bytes
+    are parsed straight from the page cache instead of being copied by read().
+    """
+    with open(path, 'rb') as f:
+        if _LOADS_ACCEPTS_BUFFER and os.fstat(f.fileno()).st_size >= _MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return _json_loads(view)
+        return _json_loads(f.read())
+
+
+def write_json_file(path, data: Any, indent: bool = False) -> None:
+    """Write UTF-8 JSON in a single write, using orjson when it is installed.
+    
+    Args:
+        path: Output file path
+        data: JSON-serializable object
+        indent: Pretty-print with 2-space indentation (for human-edited files like scenes.json)
+    """
+    with open(path, 'wb') as f:
+        f.write(_json_dumps(data, indent))
+
 
 # ============================================================================
 # Manifest Path Resolution
 # ============================================================================
 
+# Shared worker options, built once; unknown arguments (UE's own flags) are ignored.
+# exit_on_error=False: a malformed option (e.g. a trailing "--manifest" with no value) must
+# not exit the editor or print argparse usage; callers report the missing manifest themselves.
+_WORKER_ARG_PARSER = argparse.ArgumentParser(add_help=False, allow_abbrev=False, exit_on_error=False)
+_WORKER_ARG_PARSER.add_argument("--manifest", default=None)
+_WORKER_ARG_PARSER.add_argument("--shard", default=None)
+
+
+def _parse_worker_options(argv: List[str]) -> argparse.Namespace:
+    """Parse the shared worker options out of argv in a single pass.
+    
+    Returns a Namespace with every option set to None when argv is malformed.
+    """
+    try:
+        args, _ = _WORKER_ARG_PARSER.parse_known_args(argv)
+    except argparse.ArgumentError:
+        return argparse.Namespace(manifest=None, shard=None)
+    return args
+
+
+def _parse_manifest_option(argv: List[str]) -> Optional[str]:
+    """Parse ``--manifest <path>`` / ``--manifest=<path>`` out of argv, ignoring every other argument."""
+    return _parse_worker_options(argv).manifest
+
+
 def resolve_manifest_path(env_value: Optional[str], argv: List[str]) -> Optional[str]:
     """Resolve manifest path from environment variable or command-line arguments.
     
@@ -24,13 +97,7 @@ def resolve_manifest_path(env_value: Optional[str], argv: List[str]) -> Optional
     if env_value:
         return env_value
 
-    for i, arg in enumerate(argv):
-        if isinstance(arg, str) and arg.startswith("--manifest="):
-            return arg.split("=", 1)[1]
-        if arg == "--manifest" and i + 1 < len(argv):
-            return argv[i + 1]
-
-    return None
+    return _parse_manifest_option(argv)
 
 
 def resolve_manifest_path_from_env(env_key: str, argv: List[str]) -> Optional[str]:
@@ -46,10 +113,80 @@ def resolve_manifest_path_from_env(env_key: str, argv: List[str]) -> Optional[st
     return resolve_manifest_path(os.environ.get(env_key), argv)
 
 
+def parse_manifest_arg(env_key: str, argv: List[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Resolve the manifest path (env var first, then --manifest) and load the manifest.
+    
+    Shared entry point for the UE worker scripts.
+    
+    Args:
+        env_key: Environment variable name (e.g., 'UE_MANIFEST_PATH')
+        argv: Command-line arguments list
+    
+    Returns:
+        (manifest, manifest_path); manifest is None if no path was given or it could not be read
+    """
+    manifest_path = resolve_manifest_path_from_env(env_key, argv)
+    if not manifest_path:
+        logger.error("No manifest path provided")
+        logger.info(f"Usage: Set {env_key} environment variable or use --manifest=<path>")
+        return None, None
+
+    logger.info(f"Manifest: {manifest_path}")
+
+    try:
+        return load_manifest(manifest_path), manifest_path
+    except Exception as e:
+        logger.error(f"Failed to read manifest: {e}")
+        return None, manifest_path
+
+
+def parse_shard_arg(env_key: str, argv: List[str]) -> Tuple[int, int]:
+    """Resolve the ``i/k`` shard spec (env var first, then --shard) for workers that split their map list.
+    
+    Args:
+        env_key: Environment variable name (e.g., 'UE_NAVMESH_SHARD')
+        argv: Command-line arguments list
+    
+    Returns:
+        (shard_index, shard_count); (0, 1) when no shard is given or the spec is invalid
+    """
+    spec = os.environ.get(env_key)
+    if not spec:
+        spec = _parse_worker_options(argv).shard
+    if not spec:
+        return 0, 1
+
+    try:
+        index_str, count_str = spec.split("/", 1)
+        index, count = int(index_str), int(count_str)
+    except ValueError:
+        logger.warning(f"Invalid shard spec '{spec}', expected <index>/<count>; processing all items")
+        return 0, 1
+    if count < 1 or not 0 <= index < count:
+        logger.warning(f"Shard index out of range: '{spec}'; processing all items")
+        return 0, 1
+    return index, count
+
+
 # ============================================================================
 # Date Auto-Append Utility
 # ============================================================================
 
+# Output paths that already end with a date directory (e.g. ".../2026-01-22")
+_DATE_SUFFIX_RE = re.compile(r'/\d{4}-\d{2}-\d{2}$')
+
+
+@lru_cache(maxsize=None)
+def _is_output_dir_key(key: str) -> bool:
+    """Whether a manifest key names an output directory.
+    
+    Memoized: manifests reuse a small key vocabulary, so each distinct key is
+    lowercased and scanned once per process instead of at every occurrence.
+    """
+    key_lower = key.lower()
+    return ('output' in key_lower and 'dir' in key_lower) or key_lower.endswith('_dir')
+
+
 def auto_append_date_to_output_dirs(manifest: Dict[str, Any], date_format: str = "%Y-%m-%d") -> Dict[str, Any]:
     """Automatically append current date to output directory paths in manifest.
     
@@ -63,43 +200,51 @@ def auto_append_date_to_output_dirs(manifest: Dict[str, Any], date_format: str =
         date_format: Date format string (default: "%Y-%m-%d")
     
     Returns:
-        Modified manifest with dates appended to output directories
+        Manifest with dates appended to output directories. Dicts without changes
+        are shared with the input rather than copied; the input is never mutated.
     """
     today = datetime.now().strftime(date_format)
+    today_suffix = f"/{today}"
     
     def append_date_if_needed(path: str) -> str:
         """Append date to path if not already present."""
         if not path or not isinstance(path, str):
             return path
         
+        # Fast path for manifests re-run on the same day: already tagged with today
+        if path.endswith(today_suffix):
+            return path
+        
         # Normalize path separators
         normalized = path.replace('\\', '/')
         
         # Check if path already ends with a date pattern (YYYY-MM-DD or similar)
-        import re
-        date_pattern = r'/\d{4}-\d{2}-\d{2}$'
-        if re.search(date_pattern, normalized):
+        if _DATE_SUFFIX_RE.search(normalized):
             return path  # Already has date suffix
         
         # Append date
         return f"{normalized.rstrip('/')}/{today}"
     
     def process_dict(d: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively process dictionary."""
-        result = {}
+        """Recursively process dictionary.
+        
+        Copy-on-write: a dict is only copied when one of its values changes, so
+        untouched subtrees are returned as the original objects.
+        """
+        result = None
         for key, value in d.items():
             if isinstance(value, dict):
-                result[key] = process_dict(value)
-            elif isinstance(value, str):
-                # Check if this is an output directory key
-                key_lower = key.lower()
-                if ('output' in key_lower and 'dir' in key_lower) or key_lower.endswith('_dir'):
-                    result[key] = append_date_if_needed(value)
-                else:
-                    result[key] = value
+                new_value = process_dict(value)
+            elif isinstance(value, str) and _is_output_dir_key(key):
+                new_value = append_date_if_needed(value)
             else:
-                result[key] = value
-        return result
+                continue
+            
+            if new_value is not value:
+                if result is None:
+                    result = dict(d)
+                result[key] = new_value
+        return d if result is None else result
     
     return process_dict(manifest)
 
@@ -114,8 +259,7 @@ def load_manifest(manifest_path: str) -> dict:
         sys.exit(1)
     
     try:
-        with open(manifest_path, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
+        manifest = read_json_file(manifest_path)
         
         # Automatically append current date to output directories
         manifest = auto_append_date_to_output_dirs(manifest)
@@ -147,8 +291,7 @@ def load_default_ue_config() -> dict:
         return {}
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return read_json_file(config_path)
     except Exception as e:
         logger.warning(f"Failed to load UE config: {e}")
         return {}
@@ -5,7 +5,18 @@ import os
 from typing import Any, Optional
 
 
+# Minimum level comes from UE_PIPELINE_LOG_LEVEL (DEBUG/INFO/WARNING/ERROR); default prints everything.
+_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+
 class Logger:
+    def __init__(self) -> None:
+        level = os.environ.get("UE_PIPELINE_LOG_LEVEL", "DEBUG").upper()
+        self._min_level = _LEVELS.get(level, _LEVELS["DEBUG"])
+
+    def is_enabled_for(self, level: str) -> bool:
+        return _LEVELS[level] >= self._min_level
+
     @staticmethod
     def _snake_to_camel(name: str) -> str:
         parts = [p for p in name.replace("-", "_").split("_") if p]
@@ -66,17 +77,23 @@ class Logger:
         else:
             print(f"[{resolved_tag}] {message}")
 
-    def info(self, message: str, *, tag: Optional[str] = None) -> None:
-        self._emit(message, level=None, tag=tag, stacklevel=3)
+    # Extra positional args are %-formatted only when the level is enabled, so filtered
+    # messages skip both string formatting and caller-tag resolution.
+    def info(self, message: str, *args: Any, tag: Optional[str] = None) -> None:
+        if self._min_level <= _LEVELS["INFO"]:
+            self._emit(message % args if args else message, level=None, tag=tag, stacklevel=3)
 
-    def debug(self, message: str, *, tag: Optional[str] = None) -> None:
-        self._emit(message, level="DEBUG", tag=tag, stacklevel=3)
+    def debug(self, message: str, *args: Any, tag: Optional[str] = None) -> None:
+        if self._min_level <= _LEVELS["DEBUG"]:
+            self._emit(message % args if args else message, level="DEBUG", tag=tag, stacklevel=3)
 
-    def warning(self, message: str, *, tag: Optional[str] = None) -> None:
-        self._emit(message, level="WARNING", tag=tag, stacklevel=3)
+    def warning(self, message: str, *args: Any, tag: Optional[str] = None) -> None:
+        if self._min_level <= _LEVELS["WARNING"]:
+            self._emit(message % args if args else message, level="WARNING", tag=tag, stacklevel=3)
 
-    def error(self, message: str, *, tag: Optional[str] = None) -> None:
-        self._emit(message, level="ERROR", tag=tag, stacklevel=3)
+    def error(self, message: str, *args: Any, tag: Optional[str] = None) -> None:
+        if self._min_level <= _LEVELS["ERROR"]:
+            self._emit(message % args if args else message, level="ERROR", tag=tag, stacklevel=3)
 
     def blank(self, lines: int = 1) -> None:
         for _ in range(max(0, int(lines))):
@@ -3,8 +3,20 @@ from typing import Any
 from .logger import logger
 
 
+# Editor subsystems live as long as the editor; look each one up once and reuse the handle
+_editor_subsystems: dict = {}
+
+
+def _get_editor_subsystem(subsystem_class):
+    subsystem = _editor_subsystems.get(subsystem_class)
+    if subsystem is None:
+        subsystem = unreal.get_editor_subsystem(subsystem_class)
+        if subsystem is not None:
+            _editor_subsystems[subsystem_class] = subsystem
+    return subsystem
+
 def get_unreal_editor_subsystem() -> unreal.UnrealEditorSubsystem:
-    return unreal.get_editor_subsystem(unreal.UnrealEditorSubsystem)
+    return _get_editor_subsystem(unreal.UnrealEditorSubsystem)
 
 def get_editor_world() -> unreal.World:
     try:
@@ -15,13 +27,13 @@ def get_editor_world() -> unreal.World:
         raise RuntimeError(f"Failed to get editor world: {e}")
 
 def get_actor_subsystem() -> unreal.EditorActorSubsystem:
-    return unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+    return _get_editor_subsystem(unreal.EditorActorSubsystem)
 
 def get_level_editor_subsystem() -> unreal.LevelEditorSubsystem:
-    return unreal.get_editor_subsystem(unreal.LevelEditorSubsystem)
+    return _get_editor_subsystem(unreal.LevelEditorSubsystem)
 
 def get_editor_asset_subsystem() -> unreal.EditorAssetSubsystem:
-    return unreal.get_editor_subsystem(unreal.EditorAssetSubsystem)
+    return _get_editor_subsystem(unreal.EditorAssetSubsystem)
 
 def get_movie_pipeline_queue_subsystem() -> unreal.MoviePipelineQueueSubsystem:
     try:
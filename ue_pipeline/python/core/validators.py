@@ -1,12 +1,41 @@
 import unreal
 from .ue_api import get_actor_subsystem, load_map
 
+_NAVMESH_CLASS_NAMES = ("NavMeshBoundsVolume", "RecastNavMesh")
+
+
+def _find_navmesh_actor(actors):
+    """
+    单次遍历 actors，返回找到的 NavMesh 相关 actor 的类名，未找到返回 None
+    
+    按 _NAVMESH_CLASS_NAMES 的顺序优先：有 NavMeshBoundsVolume 时返回它，否则才返回 RecastNavMesh
+    """
+    navmesh_classes = tuple(
+        cls for cls in (getattr(unreal, name, None) for name in _NAVMESH_CLASS_NAMES) if cls
+    )
+    if not navmesh_classes:
+        return None
+    
+    best_rank = None
+    for actor in actors:
+        if isinstance(actor, navmesh_classes):
+            for rank, cls in enumerate(navmesh_classes):
+                if isinstance(actor, cls):
+                    if best_rank is None or rank < best_rank:
+                        best_rank = rank
+                    break
+            if best_rank == 0:
+                break
+    return navmesh_classes[best_rank].__name__ if best_rank is not None else None
+
 
 def validate_prerequisites(map_path: str, blueprint_path: str, check_navmesh: bool, log_prefix: str = "[Validator]") -> None:
     errors = []
+    map_exists = False
     
     if map_path:
-        if not unreal.EditorAssetLibrary.does_asset_exist(map_path):
+        map_exists = unreal.EditorAssetLibrary.does_asset_exist(map_path)
+        if not map_exists:
             errors.append(f"Map does not exist: {map_path}")
     
     if blueprint_path:
@@ -14,7 +43,8 @@ def validate_prerequisites(map_path: str, blueprint_path: str, check_navmesh: bo
         if not unreal.EditorAssetLibrary.does_asset_exist(normalized):
             errors.append(f"Blueprint does not exist: {blueprint_path}")
     
-    if check_navmesh and map_path:
+    # 地图不存在时无需加载地图做NavMesh检查（加载地图耗时数秒）
+    if check_navmesh and map_exists:
         navmesh_found = False
         
         try:
@@ -22,31 +52,13 @@ def validate_prerequisites(map_path: str, blueprint_path: str, check_navmesh: bo
                 errors.append(f"Failed to load map for NavMesh check: {map_path}")
             else:
                 # 检查场景中的NavMeshBoundsVolume
-                actor_subsystem = get_actor_subsystem()
-                actors = actor_subsystem.get_all_level_actors()
-                
-                # 查找NavMeshBoundsVolume
-                navmesh_bounds_cls = getattr(unreal, "NavMeshBoundsVolume", None)
-                for actor in actors:
-                    try:
-                        if navmesh_bounds_cls and isinstance(actor, navmesh_bounds_cls):
-                            navmesh_found = True
-                            print(f"{log_prefix} ✓ Found NavMeshBoundsVolume in scene")
-                            break
-                    except Exception:
-                        pass
+                actors = get_actor_subsystem().get_all_level_actors()
                 
-                # 查找RecastNavMesh
-                if not navmesh_found:
-                    recast_navmesh_cls = getattr(unreal, "RecastNavMesh", None)
-                    for actor in actors:
-                        try:
-                            if recast_navmesh_cls and isinstance(actor, recast_navmesh_cls):
-                                navmesh_found = True
-                                print(f"{log_prefix} ✓ Found RecastNavMesh in scene")
-                                break
-                        except Exception:
-                            pass
+                # 单次遍历查找 NavMeshBoundsVolume / RecastNavMesh
+                found_cls_name = _find_navmesh_actor(actors)
+                if found_cls_name:
+                    navmesh_found = True
+                    print(f"{log_prefix} ✓ Found {found_cls_name} in scene")
                 
                 if not navmesh_found:
                     errors.append(f"Map has no NavMesh (checked: NavMeshBoundsVolume, RecastNavMesh): {map_path}")
@@ -81,28 +93,13 @@ def validate_navmesh_in_scene(map_path: str, log_prefix: str = "[Validator]") ->
             return False
         
         # 检查场景中的NavMeshBoundsVolume
-        actor_subsystem = get_actor_subsystem()
-        actors = actor_subsystem.get_all_level_actors()
-        
-        # 查找NavMeshBoundsVolume
-        navmesh_bounds_cls = getattr(unreal, "NavMeshBoundsVolume", None)
-        for actor in actors:
-            try:
-                if navmesh_bounds_cls and isinstance(actor, navmesh_bounds_cls):
-                    print(f"{log_prefix} ✓ Found NavMeshBoundsVolume in scene")
-                    return True
-            except Exception:
-                pass
+        actors = get_actor_subsystem().get_all_level_actors()
         
-        # 查找RecastNavMesh
-        recast_navmesh_cls = getattr(unreal, "RecastNavMesh", None)
-        for actor in actors:
-            try:
-                if recast_navmesh_cls and isinstance(actor, recast_navmesh_cls):
-                    print(f"{log_prefix} ✓ Found RecastNavMesh in scene")
-                    return True
-            except Exception:
-                pass
+        # 单次遍历查找 NavMeshBoundsVolume / RecastNavMesh
+        found_cls_name = _find_navmesh_actor(actors)
+        if found_cls_name:
+            print(f"{log_prefix} ✓ Found {found_cls_name} in scene")
+            return True
         
         return False
     except Exception:
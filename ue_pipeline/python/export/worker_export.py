@@ -20,19 +20,8 @@ def main(argv=None) -> int:
     logger.info("Starting camera export job execution...")
 
     argv = list(argv) if argv is not None else sys.argv
-    env_key = "UE_MANIFEST_PATH"
-    manifest_path = job_utils.resolve_manifest_path_from_env(env_key, argv)
-    if not manifest_path:
-        logger.error("No manifest path provided")
-        logger.info(f"Usage: Set {env_key} environment variable or use --manifest=<path>")
-        return 1
-
-    logger.info(f"Manifest: {manifest_path}")
-
-    try:
-        manifest = job_utils.load_manifest(manifest_path)
-    except Exception as e:
-        logger.error(f"Failed to read manifest: {e}")
+    manifest, _ = job_utils.parse_manifest_arg("UE_MANIFEST_PATH", argv)
+    if manifest is None:
         return 1
 
     job_id = manifest.get("job_id", "unknown")
@@ -0,0 +1,189 @@
+"""
+NavMesh 烘焙缓存与场景库同步（不依赖 unreal 模块，Phase 1 / Phase 2 worker 与启动器共用）
+
+位于 <工程>/Saved/NavMeshBakeCache：
+    mesh_counts.json          StaticMeshActor 数量缓存
+    mesh_counts.shard<i>.json 分片 i 本次的条目，启动器在全部分片退出后合并进 mesh_counts.json
+    <地图路径哈希>.done       每张地图的烘焙标记
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from ue_pipeline.python.core import logger, job_utils
+
+
+# /Game/ 挂载点对应工程 Content 目录
+GAME_PREFIX = "/Game/"
+
+BAKE_CACHE_RELDIR = Path("Saved") / "NavMeshBakeCache"
+MESH_COUNT_CACHE_RELPATH = BAKE_CACHE_RELDIR / "mesh_counts.json"
+
+# scenes.db / scenes.json 位于仓库根目录的 database 目录
+SCENES_DB_DIR = Path(__file__).parent.parent.parent / 'database'
+
+
+def game_path_to_umap(content_dir: str, map_path: str) -> str:
+    """地图资源路径转关卡文件路径: /Game/A/Maps/M -> <Content>/A/Maps/M.umap"""
+    if map_path.startswith(GAME_PREFIX):
+        return os.path.join(content_dir, map_path[len(GAME_PREFIX):] + ".umap")
+    return os.path.join(content_dir, map_path.lstrip("/") + ".umap")
+
+
+def level_mtime(level_path: str):
+    """关卡文件 mtime，文件不存在时返回 None"""
+    try:
+        return os.stat(level_path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _write_json_atomic(path: Path, data, indent: bool = False):
+    """先写同目录临时文件再 os.replace，读者只会看到旧文件或完整的新文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        job_utils.write_json_file(tmp_path, data, indent=indent)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def get_mesh_count_cache_path(bake_cache_dir: Path, shard_index: int = None) -> Path:
+    """共享缓存 mesh_counts.json；分片进程各写自己的 mesh_counts.shard<i>.json，互不覆盖"""
+    if shard_index is None:
+        return bake_cache_dir / MESH_COUNT_CACHE_RELPATH.name
+    return bake_cache_dir / f"mesh_counts.shard{shard_index}.json"
+
+
+def load_mesh_count_cache(cache_path: Path) -> dict:
+    """
+    读取 StaticMeshActor 数量缓存
+
+    格式: {地图路径: {"mtime": 关卡文件修改时间, "mesh_count": 数量}}
+    文件不存在或损坏时返回空表
+    """
+    try:
+        data = job_utils.read_json_file(cache_path)
+        return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning("Failed to read mesh count cache: %s", e)
+        return {}
+
+
+def save_mesh_count_cache(cache_path: Path, entries: dict):
+    """
+    将条目合并进缓存文件并原子写回
+
+    同一文件只由一个进程写：分片并行时各分片写自己的文件（见 get_mesh_count_cache_path），
+    由启动器在全部分片退出后调用 merge_mesh_count_shards 合并
+    """
+    cache = {**load_mesh_count_cache(cache_path), **entries}
+    try:
+        _write_json_atomic(cache_path, cache, indent=True)
+    except Exception as e:
+        logger.warning("Failed to write mesh count cache: %s", e)
+
+
+def remove_mesh_count_shards(bake_cache_dir: Path, shard_count: int):
+    """删除上次运行中断时残留的分片缓存文件"""
+    for shard_index in range(shard_count):
+        try:
+            os.remove(get_mesh_count_cache_path(bake_cache_dir, shard_index))
+        except FileNotFoundError:
+            pass
+
+
+def merge_mesh_count_shards(bake_cache_dir: Path, shard_count: int):
+    """全部分片退出后，将各分片文件合并进 mesh_counts.json 并删除分片文件（仅启动器调用）"""
+    shard_paths = [get_mesh_count_cache_path(bake_cache_dir, i) for i in range(shard_count)]
+    entries = {}
+    for shard_path in shard_paths:
+        entries.update(load_mesh_count_cache(shard_path))
+    if entries:
+        save_mesh_count_cache(get_mesh_count_cache_path(bake_cache_dir), entries)
+    remove_mesh_count_shards(bake_cache_dir, shard_count)
+
+
+def compute_bake_key(auto_scale_kwargs: dict) -> str:
+    """烘焙参数的哈希；关卡是否变化由标记中的 mtime 单独判断"""
+    payload = json.dumps(auto_scale_kwargs, sort_keys=True).encode()
+    return hashlib.blake2b(payload).hexdigest()
+
+
+def get_bake_marker_path(bake_cache_dir: Path, map_path: str) -> Path:
+    """每张地图一个 .done 标记文件，文件名取地图路径的哈希"""
+    map_hash = hashlib.blake2b(map_path.encode(), digest_size=16).hexdigest()
+    return bake_cache_dir / f"{map_hash}.done"
+
+
+def read_bake_marker(marker_path: Path) -> dict:
+    """
+    读取 .done 标记，不存在或损坏时返回 None
+
+    格式: {"key": 烘焙键, "mtime": 关卡文件 mtime, "mesh_count": 数量, "verified": Phase 2 是否已完成}
+    """
+    try:
+        marker = job_utils.read_json_file(marker_path)
+    except (OSError, ValueError):
+        return None
+    return marker if isinstance(marker, dict) else None
+
+
+def write_bake_marker(marker_path: Path, bake_key: str, mtime: float, mesh_count: int, verified: bool):
+    """
+    写入 .done 标记
+
+    Phase 1 保存后写入 verified=False；Phase 2 重建并保存后用新的 mtime 改写为 verified=True，
+    只有后者能让下次运行跳过该地图
+    """
+    try:
+        _write_json_atomic(marker_path, {
+            "key": bake_key,
+            "mtime": mtime,
+            "mesh_count": mesh_count,
+            "verified": verified,
+        })
+    except Exception as e:
+        logger.warning("Failed to write bake marker: %s", e)
+
+
+def sync_scenes_json_low_actor(json_path: Path, updated: dict, now: str):
+    """
+    将 low_actor 状态同步到 scenes.json（整个作业只读写一次）
+    
+    分片并行时各分片不写该文件，由启动器在全部分片退出后合并各分片结果调用一次
+    
+    Args:
+        json_path: scenes.json 路径
+        updated: {scene_name: low_actor}
+        now: 本次作业的时间戳
+    """
+    if not updated or not json_path.exists():
+        return
+    
+    data = job_utils.read_json_file(json_path)
+    
+    scenes = data.get('scenes', {})
+    changed = False
+    for scene_name, is_low_actor in updated.items():
+        scene = scenes.get(scene_name)  # 每个场景只查一次字典
+        if scene is not None:
+            scene['low_actor'] = is_low_actor
+            scene['last_updated'] = now
+            changed = True
+    
+    if changed:
+        data['last_updated'] = now
+        _write_json_atomic(json_path, data, indent=True)
+        
+        logger.info("Updated JSON database")
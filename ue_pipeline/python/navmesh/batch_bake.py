@@ -57,8 +57,7 @@ class BatchBakeManager:
             logger.error(f"Database not found: {self.json_path}")
             return {}
         
-        with open(self.json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = job_utils.read_json_file(self.json_path)
         
         return data.get('scenes', {})
     
@@ -138,17 +137,33 @@ class BatchBakeManager:
             scene_name: 场景名
             updates: 更新的字段，如 {'low_actor': True, 'baked': True, 'last_baked': '2026-01-16 10:30:00'}
         """
+        self.update_scenes_metadata({scene_name: updates})
+    
+    def update_scenes_metadata(self, updates_by_scene: Dict[str, Dict]):
+        """
+        批量更新多个场景的元数据：scenes.json 只读写一次，SQLite 单连接单事务
+        
+        Args:
+            updates_by_scene: {场景名: 更新的字段}
+        """
+        if not updates_by_scene:
+            return
+        
         # 更新JSON
         if self.json_path.exists():
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = job_utils.read_json_file(self.json_path)
+            
+            scenes = data.get('scenes', {})
+            changed = False
+            for scene_name, updates in updates_by_scene.items():
+                scene = scenes.get(scene_name)
+                if scene is not None:
+                    scene.update(updates)
+                    changed = True
             
-            if scene_name in data.get('scenes', {}):
-                data['scenes'][scene_name].update(updates)
+            if changed:
                 data['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                with open(self.json_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                job_utils.write_json_file(self.json_path, data, indent=True)
         
         # 更新SQLite（如果表结构支持）
         # 注意：需要先修改scan_scene_structure.py的数据库表结构
@@ -169,17 +184,19 @@ class BatchBakeManager:
                             cursor.execute(f"ALTER TABLE scenes ADD COLUMN {field} TEXT")
                 
                 # 构建UPDATE语句
-                set_clauses = []
-                values = []
-                for key, value in updates.items():
-                    set_clauses.append(f"{key} = ?")
-                    values.append(value)
+                for scene_name, updates in updates_by_scene.items():
+                    set_clauses = []
+                    values = []
+                    for key, value in updates.items():
+                        set_clauses.append(f"{key} = ?")
+                        values.append(value)
+                    
+                    if set_clauses:
+                        values.append(scene_name)
+                        sql = f"UPDATE scenes SET {', '.join(set_clauses)} WHERE scene_name = ?"
+                        cursor.execute(sql, values)
                 
-                if set_clauses:
-                    values.append(scene_name)
-                    sql = f"UPDATE scenes SET {', '.join(set_clauses)} WHERE scene_name = ?"
-                    cursor.execute(sql, values)
-                    conn.commit()
+                conn.commit()
             finally:
                 conn.close()
     
@@ -289,63 +306,69 @@ class BatchBakeManager:
         skipped_maps = 0
         failed_maps = 0
         
+        # {场景名: 更新的字段}，循环结束（含异常中断）后一次性写入 scenes.json / scenes.db
+        pending_updates = {}
+        
         # 依次处理每个场景
-        for scene_idx, scene_data in enumerate(matched_scenes, 1):
-            scene_name = scene_data['scene_name']
-            launch_dir = scene_data['launch_directory']
-            maps = scene_data['maps']
+        try:
+            for scene_idx, scene_data in enumerate(matched_scenes, 1):
+                scene_name = scene_data['scene_name']
+                launch_dir = scene_data['launch_directory']
+                maps = scene_data['maps']
             
-            logger.blank(1)
-            logger.info(f"[SCENE {scene_idx}/{len(matched_scenes)}] {scene_name}")
-            logger.info(f"Launch Directory: {launch_dir}")
-            logger.info(f"Maps: {len(maps)}")
+                logger.blank(1)
+                logger.info(f"[SCENE {scene_idx}/{len(matched_scenes)}] {scene_name}")
+                logger.info(f"Launch Directory: {launch_dir}")
+                logger.info(f"Maps: {len(maps)}")
             
-            # 检查是否为low_actor场景
-            is_low_actor = scene_data.get('low_actor', False)
-            if is_low_actor and skip_low_actor:
-                logger.warning(f"Skipping {scene_name} (marked as low_actor)")
-                skipped_maps += len(maps)
-                continue
+                # 检查是否为low_actor场景
+                is_low_actor = scene_data.get('low_actor', False)
+                if is_low_actor and skip_low_actor:
+                    logger.warning(f"Skipping {scene_name} (marked as low_actor)")
+                    skipped_maps += len(maps)
+                    continue
             
-            # 处理每个地图
-            for map_idx, map_info in enumerate(maps, 1):
-                map_name = map_info['name']
-                map_path = map_info['path']
+                # 处理每个地图
+                for map_idx, map_info in enumerate(maps, 1):
+                    map_name = map_info['name']
+                    map_path = map_info['path']
                 
-                job_id = f"batch_bake_{scene_name}_{map_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                    job_id = f"batch_bake_{scene_name}_{map_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
                 
-                logger.blank(1)
-                logger.info(f"  [MAP {map_idx}/{len(maps)}] {map_name}")
-                logger.info(f"  Path: {map_path}")
-                logger.info(f"  Job ID: {job_id}")
+                    logger.blank(1)
+                    logger.info(f"  [MAP {map_idx}/{len(maps)}] {map_name}")
+                    logger.info(f"  Path: {map_path}")
+                    logger.info(f"  Job ID: {job_id}")
                 
-                processed_maps += 1
+                    processed_maps += 1
                 
-                if dry_run:
-                    logger.info(f"  [DRY RUN] Would bake this map")
-                    succeeded_maps += 1
-                else:
-                    # 创建作业配置
-                    manifest = self.create_job_manifest(scene_data, map_path, job_id)
+                    if dry_run:
+                        logger.info(f"  [DRY RUN] Would bake this map")
+                        succeeded_maps += 1
+                    else:
+                        # 创建作业配置
+                        manifest = self.create_job_manifest(scene_data, map_path, job_id)
                     
-                    # 执行烘焙
-                    logger.info(f"  Starting bake job...")
-                    exit_code = self.run_bake_job(manifest)
+                        # 执行烘焙
+                        logger.info(f"  Starting bake job...")
+                        exit_code = self.run_bake_job(manifest)
                     
-                    if exit_code == 0:
-                        logger.info(f"  ✓ Bake succeeded")
-                        succeeded_maps += 1
+                        if exit_code == 0:
+                            logger.info(f"  ✓ Bake succeeded")
+                            succeeded_maps += 1
                         
-                        # 更新数据库
-                        self.update_scene_metadata(scene_name, {
-                            'baked': True,
-                            'last_baked': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                    else:
-                        logger.error(f"  ✗ Bake failed with exit code: {exit_code}")
-                        failed_maps += 1
+                            # 数据库更新先暂存，全部地图处理完后统一写入
+                            pending_updates[scene_name] = {
+                                'baked': True,
+                                'last_baked': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                            }
+                        else:
+                            logger.error(f"  ✗ Bake failed with exit code: {exit_code}")
+                            failed_maps += 1
             
-            logger.separator(width=70)
+                logger.separator(width=70)
+        finally:
+            self.update_scenes_metadata(pending_updates)
         
         # 最终统计
         logger.blank(1)
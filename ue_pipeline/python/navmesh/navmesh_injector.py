@@ -10,13 +10,9 @@ class NavMeshManager:
     
     def count_static_mesh_actors(self) -> int:
         try:
-            actor_subsystem = ue_api.get_actor_subsystem()
-            all_actors = actor_subsystem.get_all_level_actors()
-            count = 0
-            
-            for actor in all_actors:
-                if isinstance(actor, unreal.StaticMeshActor):
-                    count += 1
+            # Class-filtered query runs in C++; no per-actor isinstance loop in Python
+            world = ue_api.get_editor_world()
+            count = len(unreal.GameplayStatics.get_all_actors_of_class(world, unreal.StaticMeshActor))
             
             unreal.log(f"StaticMeshActor count: {count}")
             return count
@@ -243,12 +239,11 @@ class NavMeshManager:
             unreal.log_error(f"Error enabling Landscape navigation: {str(e)}")
             return False
     
-    def _is_navigable_actor(self, actor):
-        """检查 actor 是否是可导航的"""
+    def _is_navigable_actor(self, actor, actor_class_name):
+        """检查 actor 是否是可导航的（类名由调用方预先取好）"""
         if isinstance(actor, unreal.StaticMeshActor):
             return True
         
-        actor_class_name = actor.get_class().get_name()
         if 'Landscape' in actor_class_name:
             return True
         
@@ -258,9 +253,8 @@ class NavMeshManager:
         except Exception:
             return False
     
-    def _should_skip_actor(self, actor, exclude_patterns):
-        """检查是否应该跳过该 actor"""
-        actor_class_name = actor.get_class().get_name()
+    def _should_skip_actor(self, actor, exclude_patterns, actor_class_name):
+        """检查是否应该跳过该 actor（类名由调用方预先取好）"""
         actor_name = actor.get_name()
         
         # 检查类名模式
@@ -295,32 +289,6 @@ class NavMeshManager:
         
         return True
     
-    def _collect_actor_z_centers(self, all_actors, exclude_patterns, max_reasonable_extent):
-        """收集所有可导航 actor 的 Z 中心位置"""
-        z_centers = []
-        
-        for actor in all_actors:
-            if self._should_skip_actor(actor, exclude_patterns):
-                continue
-            
-            # 跳过 Landscape 本身
-            if 'Landscape' in actor.get_class().get_name():
-                continue
-            
-            if not self._is_navigable_actor(actor):
-                continue
-            
-            origin, extent = self._get_actor_bounds_safe(actor)
-            if not origin or not extent:
-                continue
-            
-            if not self._is_valid_bounds(extent, max_reasonable_extent):
-                continue
-            
-            z_centers.append(origin.z)
-        
-        return z_centers
-    
     def _analyze_terrain_type(self, actor_z_centers, ground_plane_z):
         """分析地形类型（平原或山谷）"""
         if len(actor_z_centers) == 0:
@@ -418,6 +386,18 @@ class NavMeshManager:
             actor_subsystem = ue_api.get_actor_subsystem()
             all_actors = actor_subsystem.get_all_level_actors()
             
+            # 单次遍历：每个 actor 只取一次类名并按用途分组，后续各阶段不再重复遍历全部 actor
+            actor_class_names = []
+            landscape_actors = []
+            boundary_volumes = []
+            for actor in all_actors:
+                actor_class_name = actor.get_class().get_name()
+                actor_class_names.append(actor_class_name)
+                if 'Landscape' in actor_class_name:
+                    landscape_actors.append(actor)
+                if 'PostProcessVolume' in actor_class_name or 'LightmassImportanceVolume' in actor_class_name:
+                    boundary_volumes.append((actor, actor_class_name))
+            
             # Phase 1: Find Landscape (ground) - HIGHEST PRIORITY
             landscape_z_min = None
             landscape_z_max = None
@@ -426,31 +406,29 @@ class NavMeshManager:
             landscape_count = 0
             
             unreal.log("[Phase 1] Detecting Landscape (ground)...")
-            for actor in all_actors:
-                actor_class_name = actor.get_class().get_name()
-                if 'Landscape' in actor_class_name:
-                    try:
-                        # Get actual actor location (Transform position)
-                        actor_location = actor.get_actor_location()
-                        
-                        # Get bounds for Z range
-                        bounds_origin, extent = actor.get_actor_bounds(False)
-                        landscape_z_bottom = bounds_origin.z - extent.z  # Bottom of landscape
-                        landscape_z_top = bounds_origin.z + extent.z      # Top of landscape
-                        
-                        if landscape_z_min is None or landscape_z_bottom < landscape_z_min:
-                            landscape_z_min = landscape_z_bottom
-                        if landscape_z_max is None or landscape_z_top > landscape_z_max:
-                            landscape_z_max = landscape_z_top
-                        
-                        # Store landscape actual position Z (Transform Z - this is the ground level)
-                        if landscape_origin_z is None:
-                            landscape_origin_z = actor_location.z
-                        
-                        landscape_count += 1
-                        unreal.log(f"  Landscape #{landscape_count}: Transform Z={actor_location.z:.1f} cm (ground level), Bounds center={bounds_origin.z:.1f} cm, Z_min={landscape_z_bottom:.1f} cm, Z_max={landscape_z_top:.1f} cm")
-                    except Exception as e:
-                        unreal.log_warning(f"  Error processing Landscape: {str(e)}")
+            for actor in landscape_actors:
+                try:
+                    # Get actual actor location (Transform position)
+                    actor_location = actor.get_actor_location()
+                    
+                    # Get bounds for Z range
+                    bounds_origin, extent = actor.get_actor_bounds(False)
+                    landscape_z_bottom = bounds_origin.z - extent.z  # Bottom of landscape
+                    landscape_z_top = bounds_origin.z + extent.z      # Top of landscape
+                    
+                    if landscape_z_min is None or landscape_z_bottom < landscape_z_min:
+                        landscape_z_min = landscape_z_bottom
+                    if landscape_z_max is None or landscape_z_top > landscape_z_max:
+                        landscape_z_max = landscape_z_top
+                    
+                    # Store landscape actual position Z (Transform Z - this is the ground level)
+                    if landscape_origin_z is None:
+                        landscape_origin_z = actor_location.z
+                    
+                    landscape_count += 1
+                    unreal.log(f"  Landscape #{landscape_count}: Transform Z={actor_location.z:.1f} cm (ground level), Bounds center={bounds_origin.z:.1f} cm, Z_min={landscape_z_bottom:.1f} cm, Z_max={landscape_z_top:.1f} cm")
+                except Exception as e:
+                    unreal.log_warning(f"  Error processing Landscape: {str(e)}")
             
             if landscape_z_min is not None and landscape_z_max is not None:
                 landscape_z_center = (landscape_z_min + landscape_z_max) / 2.0
@@ -463,17 +441,15 @@ class NavMeshManager:
             # Phase 2: Find scene boundary volume as size reference
             unreal.log("[Phase 2] Finding scene boundary reference...")
             max_volume_extent = 0.0
-            for actor in all_actors:
-                actor_class_name = actor.get_class().get_name()
-                if 'PostProcessVolume' in actor_class_name or 'LightmassImportanceVolume' in actor_class_name:
-                    try:
-                        origin, extent = actor.get_actor_bounds(False)
-                        max_extent = max(extent.x, extent.y, extent.z)
-                        if max_extent > max_volume_extent:
-                            max_volume_extent = max_extent
-                        unreal.log(f"  {actor_class_name}: extent={max_extent:.0f} cm")
-                    except Exception:
-                        pass
+            for actor, actor_class_name in boundary_volumes:
+                try:
+                    origin, extent = actor.get_actor_bounds(False)
+                    max_extent = max(extent.x, extent.y, extent.z)
+                    if max_extent > max_volume_extent:
+                        max_volume_extent = max_extent
+                    unreal.log(f"  {actor_class_name}: extent={max_extent:.0f} cm")
+                except Exception:
+                    pass
             
             # Determine size threshold for filtering oversized actors
             if max_volume_extent > 0:
@@ -501,6 +477,9 @@ class NavMeshManager:
             # 收集actor位置用于密度分析
             actor_positions = []
             
+            # 通过筛选的 actor 边界 (origin, extent, 是否 Landscape)，Phase 4 直接复用，不再重新筛选
+            navigable_bounds = []
+            
             # Define non-navigable actor patterns
             exclude_patterns = [
                 'SkyAtmosphere', 'SkyLight', 'SkySphere', 'ExponentialHeightFog', 
@@ -511,13 +490,13 @@ class NavMeshManager:
                 'NavMeshBoundsVolume', 'NavigationTestingActor'
             ]
             
-            for actor in all_actors:
+            for actor, actor_class_name in zip(all_actors, actor_class_names):
                 # 跳过不可导航的 actor
-                if self._should_skip_actor(actor, exclude_patterns):
+                if self._should_skip_actor(actor, exclude_patterns, actor_class_name):
                     skipped_count += 1
                     continue
                 
-                if not self._is_navigable_actor(actor):
+                if not self._is_navigable_actor(actor, actor_class_name):
                     skipped_count += 1
                     continue
                 
@@ -540,6 +519,7 @@ class NavMeshManager:
                 
                 # 记录actor位置用于密度分析
                 actor_positions.append((origin.x, origin.y))
+                navigable_bounds.append((origin, extent, 'Landscape' in actor_class_name))
                 
                 if min_x is None:
                     min_x = actor_min_x
@@ -596,8 +576,8 @@ class NavMeshManager:
                 
                 ground_plane_z = landscape_origin_z if landscape_origin_z is not None else 0.0
                 
-                # 收集所有可导航 actor 的 Z 中心位置
-                actor_z_centers = self._collect_actor_z_centers(all_actors, exclude_patterns, max_reasonable_extent)
+                # 收集所有可导航 actor 的 Z 中心位置（跳过 Landscape 本身）
+                actor_z_centers = [origin.z for origin, extent, is_landscape in navigable_bounds if not is_landscape]
                 
                 # 分析地形类型
                 if len(actor_z_centers) > 0:
@@ -624,24 +604,7 @@ class NavMeshManager:
                 unreal.log("  No Landscape - finding dominant ground plane...")
                 
                 # 收集所有可导航 actor 的 Z_min 值
-                z_values = []
-                for actor in all_actors:
-                    if self._should_skip_actor(actor, exclude_patterns):
-                        continue
-                    
-                    if not self._is_navigable_actor(actor):
-                        continue
-                    
-                    origin, extent = self._get_actor_bounds_safe(actor)
-                    if not origin or not extent:
-                        continue
-                    
-                    if not self._is_valid_bounds(extent, max_reasonable_extent):
-                        continue
-                    
-                    # 记录底部 Z 位置
-                    actor_z_min = origin.z - extent.z
-                    z_values.append(actor_z_min)
+                z_values = [origin.z - extent.z for origin, extent, _ in navigable_bounds]
                 
                 # Find most clustered Z level (dominant ground plane)
                 if len(z_values) > 0:
@@ -3,7 +3,9 @@ import sys
 import os
 import time
 import json
+import traceback
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -12,57 +14,151 @@ _current_dir = os.path.dirname(os.path.abspath(__file__))
 workspace_root = os.path.abspath(os.path.join(_current_dir, "..", "..", ".."))
 if workspace_root not in sys.path:
     sys.path.insert(0, workspace_root)
-if _current_dir not in sys.path:
-    sys.path.insert(0, _current_dir)
 
 from ue_pipeline.python.core import ue_api
 from ue_pipeline.python.core import logger, job_utils
 from ue_pipeline.python.assets import save_current_level
+from ue_pipeline.python.navmesh.bake_cache import (
+    GAME_PREFIX, BAKE_CACHE_RELDIR,
+    game_path_to_umap, level_mtime,
+    get_mesh_count_cache_path, load_mesh_count_cache, save_mesh_count_cache,
+    compute_bake_key, get_bake_marker_path, read_bake_marker, write_bake_marker,
+    SCENES_DB_DIR, sync_scenes_json_low_actor,
+)
 
 
-def process_single_map(map_path: str, manager, navmesh_config: dict) -> dict:
-    scale_margin = navmesh_config.get("scale_margin", 1.2)
-    min_scale = navmesh_config.get("min_scale", [20.0, 20.0, 5.0])
-    max_scale = navmesh_config.get("max_scale", [500.0, 500.0, 50.0])
-    agent_max_step_height = navmesh_config.get("agent_max_step_height", 50.0)
-    agent_max_jump_height = navmesh_config.get("agent_max_jump_height", 200.0)
+# server 模式下每个作业的状态行前缀，便于编排进程从混杂的 stdout 中识别
+SERVER_STATUS_PREFIX = "@@NAVMESH_STATUS "
+
+# StaticMeshActor 数量低于该值的地图标记为 low_actor
+LOW_MESH_THRESHOLD = 50
+
+# 预扫描关卡文件时的 stat 线程数（纯 I/O 等待）
+LEVEL_STAT_WORKERS = 4
+
+
+# 首次使用时才导入（会触发 UE 资源注册表预热），之后在同一编辑器会话中复用
+_NavMeshManager = None
+
+
+def _get_navmesh_manager_class():
+    global _NavMeshManager
+    if _NavMeshManager is None:
+        from ue_pipeline.python.navmesh.navmesh_injector import NavMeshManager
+        _NavMeshManager = NavMeshManager
+    return _NavMeshManager
+
+
+_navmesh_manager = None
+
+
+def _get_navmesh_manager():
+    """NavMeshManager 实例在同一编辑器会话内复用（server 模式下跨作业共享）"""
+    global _navmesh_manager
+    if _navmesh_manager is None:
+        _navmesh_manager = _get_navmesh_manager_class()()
+    return _navmesh_manager
+
+
+def write_job_result(result_path: str, result: dict):
+    """
+    将作业结果（计数 + 失败地图列表）写入 JSON 文件，供启动器/CI 直接解析，无需扫描日志
+    
+    Args:
+        result_path: 输出文件路径（UE_NAVMESH_RESULT，默认 <manifest>.result.json）
+        result: {"job_id", "total", "success", "skipped", "failed", "failed_maps": [{"map", "error"}],
+                 "skipped_maps": [地图路径], "low_actor": {场景名: low_actor}（仅分片进程填写）}
+    """
+    try:
+        job_utils.write_json_file(result_path, result)
+    except Exception as e:
+        logger.warning("Failed to write job result: %s", e)
+
+
+def stat_level_files(content_dir: str, maps: list) -> dict:
+    """
+    加载任何地图之前并发 stat 全部关卡文件
     
-    # 1. 加载地图
+    Returns:
+        {地图资源路径: 关卡文件 mtime，文件不存在时为 None}
+    """
+    level_paths = [game_path_to_umap(content_dir, map_path) for map_path in maps]
+    with ThreadPoolExecutor(max_workers=LEVEL_STAT_WORKERS) as pool:
+        return dict(zip(maps, pool.map(level_mtime, level_paths)))
+
+
+def process_single_map(map_path: str, manager, auto_scale_kwargs: dict, content_dir: str,
+                       mesh_count_cache: dict, bake_cache_dir: Path = None,
+                       level_mtimes: dict = None, force_rebake: bool = False) -> dict:
+    """
+    处理单张地图：加载、统计、添加NavMesh并保存
+    
+    Args:
+        map_path: 地图资源路径
+        manager: NavMeshManager 实例
+        auto_scale_kwargs: 传给 manager.auto_scale_navmesh 的参数（循环外解析一次）
+        content_dir: 工程 Content 目录字符串（循环外解析一次）
+        mesh_count_cache: StaticMeshActor 数量缓存，按关卡文件 mtime 校验，原地更新
+        bake_cache_dir: .done 标记目录；为 None 时不读写标记
+        level_mtimes: stat_level_files 的预扫描结果，避免重复 stat
+        force_rebake: 为 True 时忽略已有标记，但保存后仍写入新标记
+    """
+    # 1. 记录文件修改时间，关卡与烘焙参数均未变化时直接跳过（无需加载地图）
+    full_level_path = game_path_to_umap(content_dir, map_path)
+    if level_mtimes is not None and map_path in level_mtimes:
+        pre_bake_mtime = level_mtimes[map_path]
+    else:
+        pre_bake_mtime = level_mtime(full_level_path)
+    if pre_bake_mtime is not None:
+        logger.info("Level file tracked: %s", full_level_path)
+    
+    # 标记的 mtime 由 Phase 2 保存后写入（Phase 2 每次都会重新保存关卡），verified 表示 Phase 2 已完成
+    bake_key = compute_bake_key(auto_scale_kwargs)
+    marker_path = get_bake_marker_path(bake_cache_dir, map_path) if bake_cache_dir is not None else None
+    if marker_path is not None and pre_bake_mtime is not None and not force_rebake:
+        marker = read_bake_marker(marker_path) or {}
+        mesh_count = marker.get("mesh_count")
+        # 缺少数量的标记视为未命中
+        if (isinstance(mesh_count, int) and marker.get("verified")
+                and marker.get("key") == bake_key and marker.get("mtime") == pre_bake_mtime):
+            is_low_mesh = mesh_count < LOW_MESH_THRESHOLD
+            logger.info("Skipped: level and bake settings unchanged since last bake")
+            logger.info("Map metadata: mesh_count=%d, low_mesh=%s", mesh_count, is_low_mesh)
+            logger.plain("")
+            return {
+                "success": True,
+                "error": None,
+                "mesh_count": mesh_count,
+                "is_low_mesh": is_low_mesh,
+                "skipped": True
+            }
+    
+    # 2. 加载地图
     if not ue_api.load_map(map_path):
-        logger.error(f"Failed to load map: {map_path}")
-        logger.error(f"Map file does not exist or cannot be loaded")
-        logger.error(f"Aborting task - no point continuing if map doesn't exist")
-        unreal.SystemLibrary.quit_editor()
+        logger.error("Failed to load map: %s", map_path)
+        logger.error("Map file does not exist or cannot be loaded")
+        logger.error("Aborting task - no point continuing if map doesn't exist")
         return {"success": False, "error": "Map file not found"}
     
-    # 2. 统计StaticMeshActor数量
-    logger.info("Counting StaticMeshActors...")
-    mesh_count = manager.count_static_mesh_actors()
-    is_low_mesh = mesh_count < 50
-    logger.info(f"StaticMeshActor count: {mesh_count}")
-    logger.info(f"LowMesh status: {is_low_mesh}")
-    
-    # 3. 更新数据库状态
-    update_scene_low_actor_status(map_path, is_low_mesh)
+    # 3. 统计StaticMeshActor数量（关卡文件未变化时直接用缓存）
+    cached = mesh_count_cache.get(map_path)
+    if cached and pre_bake_mtime is not None and cached.get("mtime") == pre_bake_mtime:
+        mesh_count = cached["mesh_count"]
+        logger.info("StaticMeshActor count (cached): %d", mesh_count)
+    else:
+        logger.info("Counting StaticMeshActors...")
+        mesh_count = manager.count_static_mesh_actors()
+        logger.info("StaticMeshActor count: %d", mesh_count)
+        if pre_bake_mtime is not None:
+            mesh_count_cache[map_path] = {"mtime": pre_bake_mtime, "mesh_count": mesh_count}
+    is_low_mesh = mesh_count < LOW_MESH_THRESHOLD
+    logger.info("LowMesh status: %s", is_low_mesh)
     
-    # 4. 记录文件修改时间
-    level_path = map_path.replace("/Game/", "/Content/") + ".umap"
-    project_path = Path(unreal.Paths.project_content_dir()).parent
-    full_level_path = project_path / level_path.lstrip("/")
-    pre_bake_mtime = None
-    if full_level_path.exists():
-        pre_bake_mtime = full_level_path.stat().st_mtime
-        logger.info(f"Level file tracked: {full_level_path}")
+    # 4. 数据库状态在所有地图处理完后统一更新（见 flush_scene_low_actor_status）
     
     # 5. 添加或配置NavMesh
     logger.info("Using auto-scale mode...")
-    navmesh = manager.auto_scale_navmesh(
-        margin=scale_margin,
-        min_scale=min_scale,
-        max_scale=max_scale,
-        agent_max_step_height=agent_max_step_height,
-        agent_max_jump_height=agent_max_jump_height,
-    )
+    navmesh = manager.auto_scale_navmesh(**auto_scale_kwargs)
     
     if not navmesh:
         logger.warning("NavMesh volume not created (may already exist)")
@@ -72,23 +168,30 @@ def process_single_map(map_path: str, manager, navmesh_config: dict) -> dict:
     logger.info("Phase 1 mode: Skipping build wait, will be triggered in Phase 2")
     
     # 6. 保存关卡
-    logger.info(f"Saving level: {map_path}")
-    save_start = time.time()
+    logger.info("Saving level: %s", map_path)
+    # 仅在 INFO 日志输出时计时
+    timed = logger.is_enabled_for("INFO")
+    save_start = time.perf_counter_ns() if timed else 0
     try:
         save_current_level()
-        save_elapsed = time.time() - save_start
-        logger.info(f"Level saved successfully ({save_elapsed:.2f}s)")
+        if timed:
+            logger.info("Level saved successfully (%.2fs)", (time.perf_counter_ns() - save_start) / 1e9)
         
         # 验证保存
-        if full_level_path.exists():
-            post_bake_mtime = full_level_path.stat().st_mtime
+        post_bake_mtime = level_mtime(full_level_path)
+        if post_bake_mtime is not None:
+            # 添加 NavMeshBoundsVolume 不改变 StaticMeshActor 数量，缓存随新 mtime 一起更新
+            mesh_count_cache[map_path] = {"mtime": post_bake_mtime, "mesh_count": mesh_count}
+            if marker_path is not None:
+                # Phase 2 重建并保存后才改写为 verified
+                write_bake_marker(marker_path, bake_key, post_bake_mtime, mesh_count, verified=False)
             if pre_bake_mtime and post_bake_mtime > pre_bake_mtime:
                 logger.info("Save verified - file modified")
             elif pre_bake_mtime:
                 logger.warning("File modification time unchanged")
     
     except Exception as e:
-        logger.error(f"Failed to save level: {e}")
+        logger.error("Failed to save level: %s", e)
         return {
             "success": False, 
             "error": f"Failed to save: {e}",
@@ -96,8 +199,8 @@ def process_single_map(map_path: str, manager, navmesh_config: dict) -> dict:
             "is_low_mesh": is_low_mesh
         }
     
-    logger.info(f"Completed: {map_path}")
-    logger.info(f"Map metadata: mesh_count={mesh_count}, low_mesh={is_low_mesh}")
+    logger.info("Completed: %s", map_path)
+    logger.info("Map metadata: mesh_count=%d, low_mesh=%s", mesh_count, is_low_mesh)
     logger.plain("")
     
     return {
@@ -108,104 +211,122 @@ def process_single_map(map_path: str, manager, navmesh_config: dict) -> dict:
     }
 
 
-def update_scene_low_actor_status(map_path: str, is_low_actor: bool):
-    """更新场景的low_actor状态到数据库"""
-    try:
-        # 从地图路径提取场景名 /Game/LaunchDir/Maps/MapName -> LaunchDir
-        path_parts = map_path.strip('/').split('/')
-        if len(path_parts) < 2 or path_parts[0] != 'Game':
-            logger.warning(f"Invalid map path format: {map_path}")
-            return
-        
-        launch_dir = path_parts[1]  # 启动目录名
-        
-        # 获取数据库路径
-        script_dir = Path(__file__).parent.parent
-        repo_root = script_dir.parent
-        db_dir = repo_root / 'database'
-        db_path = db_dir / 'scenes.db'
-        json_path = db_dir / 'scenes.json'
-        
-        if not db_path.exists():
-            logger.warning(f"Database not found: {db_path}")
-            return
-        
-        # 更新SQLite数据库
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        try:
-            # 通过launch_directory查找场景
-            cursor.execute('SELECT scene_name FROM scenes WHERE launch_directory = ?', (launch_dir,))
-            row = cursor.fetchone()
-            
-            if not row:
-                logger.warning(f"Scene not found in database: {launch_dir}")
-                return
-            
-            scene_name = row[0]
-            
-            # 更新low_actor状态
-            cursor.execute('''
-                UPDATE scenes SET low_actor = ?, last_updated = ?
-                WHERE scene_name = ?
-            ''', (1 if is_low_actor else 0, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), scene_name))
-            
-            conn.commit()
-            logger.info(f"Updated database: {scene_name} low_actor={is_low_actor}")
-            
-            # 同步更新JSON文件
-            if json_path.exists():
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                if scene_name in data.get('scenes', {}):
-                    data['scenes'][scene_name]['low_actor'] = is_low_actor
-                    data['scenes'][scene_name]['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    data['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    
-                    with open(json_path, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    
-                    logger.info(f"Updated JSON database")
-        finally:
-            conn.close()
-            
-    except Exception as e:
-        logger.warning(f"Failed to update database: {e}")
+# SELECT ... IN (...) 每批的参数个数，低于 SQLite 的变量数上限
+_SQL_IN_BATCH = 500
 
+# 语句文本固定，sqlite3 的语句缓存跨批次、跨作业复用同一份编译结果
+_UPDATE_LOW_ACTOR_SQL = "UPDATE scenes SET low_actor = ?, last_updated = ? WHERE launch_directory = ?"
 
-def main(argv=None) -> int:
-    logger.info("Starting NavMesh bake job execution...")
-    # logger.info(f"Python version: {sys.version}")
-    logger.info(f"Working directory: {os.getcwd()}")
 
-    argv = list(argv) if argv is not None else sys.argv
+def launch_dir_from_map_path(map_path: str) -> str:
+    """从地图路径提取启动目录名 /Game/LaunchDir/Maps/MapName -> LaunchDir，格式不符时返回 None"""
+    path_parts = map_path.strip('/').split('/')
+    if len(path_parts) < 2 or path_parts[0] != 'Game':
+        return None
+    return path_parts[1]
 
-    env_key = "UE_NAVMESH_MANIFEST"
-    manifest_path = job_utils.resolve_manifest_path_from_env(env_key, argv)
-    if not manifest_path:
-        logger.error("No manifest path provided")
-        logger.info(f"sys.argv: {sys.argv}")
-        logger.info(f"Environment vars: {env_key}={os.environ.get(env_key)}")
-        return 1
 
-    logger.info(f"Manifest: {manifest_path}")
+# WAL + synchronous=NORMAL：提交不再每次完整 fsync，读者（JSON 同步、batch_bake）不被写入阻塞；
+# busy_timeout 让分片并行的多个 UE 进程写同一个库时排队等待而不是直接报 locked
+_SCENES_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
 
-    try:
-        manifest = job_utils.load_manifest(manifest_path)
-    except Exception as e:
-        logger.error(f"Failed to read manifest: {e}")
-        return 1
 
+def open_scenes_db(db_path: Path) -> sqlite3.Connection:
+    """打开 scenes.db，应用 _SCENES_DB_PRAGMAS 并确保索引存在（每次作业只打开一次，由 run_bake_job 负责关闭）"""
+    conn = sqlite3.connect(db_path)
+    for pragma in _SCENES_DB_PRAGMAS:
+        conn.execute(pragma)
+    # low_actor 按 launch_directory 查询/更新，建索引后每次都是一次 B 树查找
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_scenes_launch_directory ON scenes(launch_directory)')
+    conn.commit()
+    return conn
+
+
+def flush_scene_low_actor_status(conn: sqlite3.Connection, updates: list, now: str) -> dict:
+    """
+    在单个事务中批量写入场景的 low_actor 状态
+    
+    Args:
+        conn: scenes.db 连接
+        updates: [(启动目录名, low_actor 0/1)]
+        now: 本次作业的时间戳（作业开始时生成一次，库与 JSON 共用）
+    
+    Returns:
+        {scene_name: low_actor}，供同步 scenes.json 使用
+    """
+    if not updates:
+        return {}
+    
+    low_actor_by_dir = dict(updates)  # 同一启动目录以最后一次结果为准
+    launch_dirs = list(low_actor_by_dir)
+    
+    # 分批 IN 查询解析场景名，不再每个启动目录一条 SELECT
+    scene_by_dir = {}
+    for start in range(0, len(launch_dirs), _SQL_IN_BATCH):
+        batch = launch_dirs[start:start + _SQL_IN_BATCH]
+        placeholders = ','.join('?' * len(batch))
+        for scene_name, launch_dir in conn.execute(
+                f'SELECT scene_name, launch_directory FROM scenes WHERE launch_directory IN ({placeholders})',
+                batch):
+            scene_by_dir.setdefault(launch_dir, scene_name)
+    
+    for launch_dir in launch_dirs:
+        if launch_dir not in scene_by_dir:
+            logger.warning("Scene not found in database: %s", launch_dir)
+    
+    with conn:
+        conn.executemany(_UPDATE_LOW_ACTOR_SQL,
+                         [(low_actor_by_dir[launch_dir], now, launch_dir) for launch_dir in scene_by_dir])
+    
+    updated = {scene_name: bool(low_actor_by_dir[launch_dir]) for launch_dir, scene_name in scene_by_dir.items()}
+    for scene_name, is_low_actor in updated.items():
+        logger.info("Updated database: %s low_actor=%s", scene_name, is_low_actor)
+    return updated
+
+
+def get_job_result_path(manifest_path: str, shard: tuple, server: bool = False) -> str:
+    """
+    作业结果文件路径: <manifest>[.shard<i>].result.json
+    
+    非 server 模式下 UE_NAVMESH_RESULT 优先；server 模式下固定按清单路径推导，便于编排进程按作业区分
+    """
+    shard_index, shard_count = shard
+    shard_suffix = f".shard{shard_index}" if shard_count > 1 else ""
+    result_path = f"{manifest_path}{shard_suffix}.result.json"
+    if not server:
+        result_path = os.environ.get("UE_NAVMESH_RESULT") or result_path
+    return result_path
+
+
+def run_bake_job(manifest: dict, manifest_path: str, argv: list, server: bool = False,
+                 shard: tuple = None) -> int:
+    """
+    执行一个烘焙作业（单次运行与 server 模式共用）
+    
+    Args:
+        manifest: 已解析的作业清单
+        manifest_path: 清单路径，用于推导结果文件路径
+        argv: 命令行参数（shard 为 None 时从中解析 --shard）
+        server: server 模式下地图缺失不退出编辑器，结果文件写到 get_job_result_path 推导的路径
+        shard: 已解析的 (shard_index, shard_count)，server 模式启动时解析一次后传入
+    """
+    # 本次作业写入数据库/JSON 的统一时间戳
+    run_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     job_id = manifest.get("job_id", "unknown")
     job_type = manifest.get("job_type", "unknown")
 
-    logger.info(f"Job ID: {job_id}")
-    logger.info(f"Job Type: {job_type}")
+    logger.info("Job ID: %s", job_id)
+    logger.info("Job Type: %s", job_type)
 
     if job_type != "bake_navmesh":
-        logger.error(f"Invalid job type '{job_type}', expected 'bake_navmesh'")
+        logger.error("Invalid job type '%s', expected 'bake_navmesh'", job_type)
         return 1
 
     navmesh_config = manifest.get("navmesh_config", {})
@@ -218,55 +339,145 @@ def main(argv=None) -> int:
 
     agent_max_step_height = navmesh_config.get("agent_max_step_height", 50.0)
     agent_max_jump_height = navmesh_config.get("agent_max_jump_height", 200.0)
+    force_rebake = navmesh_config.get("force_rebake", False)
 
     if not maps:
         logger.error("No maps specified in navmesh_config")
         return 1
 
-    logger.info(f"Scale margin: {scale_margin}")
-    logger.info(f"Min scale: {min_scale}")
-    logger.info(f"Max scale: {max_scale}")
-    logger.info(f"Agent MaxStepHeight: {agent_max_step_height} cm")
-    logger.info(f"Agent MaxJumpHeight: {agent_max_jump_height} cm")
-    logger.info(f"Maps to process: {len(maps)}")
-
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    if current_dir not in sys.path:
-        sys.path.insert(0, current_dir)
-
-    from ue_pipeline.python.navmesh.navmesh_injector import NavMeshManager
+    # 多进程分片：启动器为每个 UE 进程指定 i/k，只处理 maps[i::k]
+    if shard is None:
+        shard = job_utils.parse_shard_arg("UE_NAVMESH_SHARD", argv)
+    shard_index, shard_count = shard
+    if shard_count > 1:
+        maps = maps[shard_index::shard_count]
+        logger.info("Shard %d/%d: %d map(s)", shard_index, shard_count, len(maps))
+    result_path = get_job_result_path(manifest_path, shard, server)
+
+    logger.info("Scale margin: %s", scale_margin)
+    logger.info("Min scale: %s", min_scale)
+    logger.info("Max scale: %s", max_scale)
+    logger.info("Agent MaxStepHeight: %s cm", agent_max_step_height)
+    logger.info("Agent MaxJumpHeight: %s cm", agent_max_jump_height)
+    logger.info("Force rebake: %s", force_rebake)
+    logger.info("Maps to process: %d", len(maps))
+
+    # 循环不变量只解析一次
+    auto_scale_kwargs = {
+        "margin": scale_margin,
+        "min_scale": min_scale,
+        "max_scale": max_scale,
+        "agent_max_step_height": agent_max_step_height,
+        "agent_max_jump_height": agent_max_jump_height,
+    }
+    content_dir = unreal.Paths.project_content_dir()
+    project_root = os.path.dirname(content_dir.rstrip('/\\'))
+    project_path = Path(project_root)
+    bake_cache_dir = project_path / BAKE_CACHE_RELDIR
+    mesh_count_cache = load_mesh_count_cache(get_mesh_count_cache_path(bake_cache_dir))
+    # 分片进程不写共享缓存，只把本分片地图的条目写入自己的文件，由启动器在全部分片退出后合并
+    mesh_count_cache_path = get_mesh_count_cache_path(bake_cache_dir, shard_index if shard_count > 1 else None)
+
+    # 加载前先检查全部关卡文件，缺失时一次性报告并退出，不必等 UE 逐张加载失败
+    level_mtimes = stat_level_files(content_dir, maps)
+    missing_maps = [m for m in maps if level_mtimes[m] is None and m.startswith(GAME_PREFIX)]
+    if missing_maps:
+        logger.error("%d map file(s) not found, aborting before loading any map:", len(missing_maps))
+        for map_path in missing_maps:
+            # 启动器在 Phase 1 日志中匹配 "Map file does not exist"
+            logger.error("Map file does not exist: %s", map_path)
+        write_job_result(result_path, {
+            "job_id": job_id,
+            "total": len(maps),
+            "success": 0,
+            "skipped": 0,
+            "failed": len(missing_maps),
+            "failed_maps": [{"map": m, "error": "Map file not found"} for m in missing_maps],
+            "skipped_maps": [],
+        })
+        if not server:
+            unreal.SystemLibrary.quit_editor()
+        return 1
 
     try:
-        manager = NavMeshManager()
+        manager = _get_navmesh_manager()
         total_maps = len(maps)
         success_count = 0
+        skipped_count = 0
         failed_count = 0
         failed_maps = []
+        skipped_maps = []  # 启动器据此跳过这些地图的 Phase 2
+        low_actor_updates = []  # [(启动目录名, low_actor 0/1)]，循环结束后单事务写库
+        db_path = SCENES_DB_DIR / 'scenes.db'
+        scenes_conn = open_scenes_db(db_path) if db_path.exists() else None
+        if scenes_conn is None:
+            logger.warning("Database not found: %s", db_path)
 
         logger.info("=" * 60)
         logger.info("Starting NavMesh Bake Process")
         logger.info("=" * 60)
 
-        for i, map_path in enumerate(maps, 1):
-            logger.info(f"[{i}/{total_maps}] Processing: {map_path}")
-            
-            result = process_single_map(map_path, manager, navmesh_config)
-            
-            if result["success"]:
-                success_count += 1
-            else:
-                failed_count += 1
-                failed_maps.append({"map": map_path, "error": result["error"]})
-                # 如果是地图文件不存在，直接退出
-                if "Map file not found" in result["error"]:
-                    return 1
+        try:
+            for i, map_path in enumerate(maps, 1):
+                logger.info("[%d/%d] Processing: %s", i, total_maps, map_path)
+                result = process_single_map(map_path, manager, auto_scale_kwargs, content_dir,
+                                            mesh_count_cache, bake_cache_dir, level_mtimes, force_rebake)
+                if "is_low_mesh" in result:
+                    launch_dir = launch_dir_from_map_path(map_path)
+                    if launch_dir is None:
+                        logger.warning("Invalid map path format: %s", map_path)
+                    else:
+                        low_actor_updates.append((launch_dir, 1 if result["is_low_mesh"] else 0))
+                
+                if result["success"]:
+                    success_count += 1
+                    if result.get("skipped"):
+                        skipped_count += 1
+                        skipped_maps.append(map_path)
+                else:
+                    failed_count += 1
+                    failed_maps.append({"map": map_path, "error": result["error"]})
+                    # 如果是地图文件不存在，直接退出
+                    if "Map file not found" in result["error"]:
+                        if not server:
+                            unreal.SystemLibrary.quit_editor()
+                        return 1
+        finally:
+            # 关卡本身仍逐个保存（加载下一张地图会卸载当前关卡），数据库状态在此一次性写入
+            low_actor_by_scene = {}
+            if scenes_conn is not None:
+                try:
+                    updated = flush_scene_low_actor_status(scenes_conn, low_actor_updates, run_timestamp)
+                    if shard_count > 1:
+                        # 分片进程不写 scenes.json，结果随结果文件交给启动器合并后统一写入
+                        low_actor_by_scene = updated
+                    else:
+                        sync_scenes_json_low_actor(SCENES_DB_DIR / 'scenes.json', updated, run_timestamp)
+                except Exception as e:
+                    logger.warning("Failed to update database: %s", e)
+                finally:
+                    scenes_conn.close()
+            save_mesh_count_cache(mesh_count_cache_path,
+                                  {m: mesh_count_cache[m] for m in maps if m in mesh_count_cache})
+            write_job_result(result_path, {
+                "job_id": job_id,
+                "total": total_maps,
+                "success": success_count,
+                "skipped": skipped_count,
+                "failed": failed_count,
+                "failed_maps": failed_maps,
+                "skipped_maps": skipped_maps,
+                "low_actor": low_actor_by_scene,
+            })
 
         logger.info("=" * 60)
         logger.info("NavMesh Bake Process Complete")
         logger.info("=" * 60)
-        logger.info(f"Total maps: {total_maps}")
-        logger.info(f"Success: {success_count}")
-        logger.info(f"Failed: {failed_count}")
+        logger.info("Total maps: %d", total_maps)
+        logger.info("Success: %d", success_count)
+        logger.info("Skipped (unchanged): %d", skipped_count)
+        logger.info("Failed: %d", failed_count)
+        logger.info("Result file: %s", result_path)
 
         if failed_maps:
             logger.info("Failed maps details:")
@@ -276,18 +487,75 @@ def main(argv=None) -> int:
         logger.info("=" * 60)
 
         if failed_count > 0:
-            logger.warning(f"{failed_count} map(s) failed")
+            logger.warning("%d map(s) failed", failed_count)
             return 1
         else:
             logger.info("All maps processed successfully")
             return 0
 
     except Exception as e:
-        logger.error(f"Failed to execute NavMesh bake job: {e}")
-        import traceback
+        logger.error("Failed to execute NavMesh bake job: %s", e)
         traceback.print_exc()
         return 1
 
 
+def serve(argv: list) -> int:
+    """
+    常驻模式：从 stdin 逐行读取 manifest 路径并依次执行，编辑器与 NavMeshManager 跨作业复用
+    
+    每个作业结束后输出一行 SERVER_STATUS_PREFIX + JSON 状态，与普通日志区分；
+    stdin 关闭或读到 "quit" 时退出
+    """
+    logger.info("Server mode: reading manifest paths from stdin")
+    # 分片参数来自命令行/环境变量，整个常驻进程期间不变
+    shard = job_utils.parse_shard_arg("UE_NAVMESH_SHARD", argv)
+    for line in sys.stdin:
+        manifest_path = line.strip()
+        if not manifest_path:
+            continue
+        if manifest_path == "quit":
+            break
+        
+        try:
+            manifest = job_utils.load_manifest(manifest_path)
+            exit_code = run_bake_job(manifest, manifest_path, argv, server=True, shard=shard)
+        except SystemExit as e:
+            # load_manifest 在清单缺失/无法解析时调用 sys.exit，不能让它结束常驻进程
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            # 单个作业的异常（stat 关卡文件、读缓存、unreal 调用等）只让该作业失败，继续服务后续作业
+            logger.error("Job failed with unhandled exception: %s", e)
+            traceback.print_exc()
+            exit_code = 1
+        
+        status = {
+            "manifest": manifest_path,
+            "exit_code": exit_code,
+            "result": get_job_result_path(manifest_path, shard, server=True),
+        }
+        sys.stdout.write(SERVER_STATUS_PREFIX + json.dumps(status, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    
+    logger.info("Server mode: no more jobs, exiting")
+    return 0
+
+
+def main(argv=None) -> int:
+    logger.info("Starting NavMesh bake job execution...")
+    # logger.info(f"Python version: {sys.version}")
+    logger.info("Working directory: %s", os.getcwd())
+
+    argv = list(argv) if argv is not None else sys.argv
+
+    if "--server" in argv:
+        return serve(argv)
+
+    manifest, manifest_path = job_utils.parse_manifest_arg("UE_NAVMESH_MANIFEST", argv)
+    if manifest is None:
+        return 1
+
+    return run_bake_job(manifest, manifest_path, argv)
+
+
 if __name__ == "__main__":
     sys.exit(main())
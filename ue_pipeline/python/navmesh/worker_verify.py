@@ -2,6 +2,7 @@ import unreal
 import sys
 import os
 import time
+from pathlib import Path
 
 _current_dir = os.path.dirname(os.path.abspath(__file__))
 # Add workspace root to path for ue_pipeline imports
@@ -13,6 +14,16 @@ if _current_dir not in sys.path:
 
 from ue_pipeline.python.core import logger, get_editor_world, get_navigation_system
 from ue_pipeline.python.assets import save_current_level
+from ue_pipeline.python.navmesh.bake_cache import (
+    BAKE_CACHE_RELDIR, game_path_to_umap, level_mtime,
+    get_mesh_count_cache_path, load_mesh_count_cache, save_mesh_count_cache,
+    get_bake_marker_path, read_bake_marker, write_bake_marker,
+)
+
+# Rebuild wait (seconds): time allowed for the build to start, overall limit, poll interval
+REBUILD_START_TIMEOUT = 10.0
+REBUILD_TIMEOUT = 40.0
+POLL_INTERVAL = 0.25
 
 
 def trigger_navmesh_rebuild(world) -> bool:
@@ -34,31 +45,29 @@ def trigger_navmesh_rebuild(world) -> bool:
         logger.info("Executing RebuildNavigation command...")
         unreal.SystemLibrary.execute_console_command(editor_world, "RebuildNavigation")
         
-        # Wait for rebuild to start and complete
+        # Poll instead of a fixed sleep: return as soon as the rebuild has run
         logger.info("Waiting for NavMesh rebuild to complete...")
-        time.sleep(10)
+        start = time.monotonic()
         
-        # Check final build status
-        nav_sys = get_navigation_system(world)
-        if nav_sys.is_navigation_being_built(world):
-            logger.info("Navigation is being built")
-            # Wait a bit more if still building
-            max_wait = 30
-            elapsed = 0
-            while nav_sys.is_navigation_being_built(world) and elapsed < max_wait:
-                time.sleep(2)
-                elapsed += 2
-                logger.info(f"Still building... ({elapsed}s)")
-            
-            if nav_sys.is_navigation_being_built(world):
+        # Wait for the rebuild to start
+        while (not nav_sys.is_navigation_being_built(world)
+               and time.monotonic() - start < REBUILD_START_TIMEOUT):
+            time.sleep(POLL_INTERVAL)
+        
+        # Wait for the rebuild to finish
+        last_log = 0.0
+        while nav_sys.is_navigation_being_built(world):
+            elapsed = time.monotonic() - start
+            if elapsed >= REBUILD_TIMEOUT:
                 logger.warning("NavMesh build still in progress after timeout")
                 return False
-            else:
-                logger.info("NavMesh build completed")
-                return True
-        else:
-            logger.info("NavMesh build completed")
-            return True
+            if elapsed - last_log >= 2.0:
+                logger.info(f"Still building... ({elapsed:.0f}s)")
+                last_log = elapsed
+            time.sleep(POLL_INTERVAL)
+        
+        logger.info(f"NavMesh build completed ({time.monotonic() - start:.1f}s)")
+        return True
             
     except Exception as e:
         logger.error(f"Failed to trigger NavMesh rebuild: {e}")
@@ -67,6 +76,38 @@ def trigger_navmesh_rebuild(world) -> bool:
         return False
 
 
+def get_bake_cache_dir(content_dir: str):
+    """<Project>/Saved/NavMeshBakeCache, the directory Phase 1 writes its bake caches to"""
+    return Path(os.path.dirname(content_dir.rstrip('/\\'))) / BAKE_CACHE_RELDIR
+
+
+def finalize_bake_marker(bake_cache_dir, map_path: str, pre_save_mtime, post_save_mtime, verified: bool):
+    """Re-stamp the Phase 1 marker with the mtime of the Phase 2 save.
+    
+    Only a marker Phase 1 wrote for the level file as loaded here is updated; otherwise
+    the marker stays stale and the map is baked again on the next run.
+    """
+    marker_path = get_bake_marker_path(bake_cache_dir, map_path)
+    marker = read_bake_marker(marker_path)
+    if not marker or marker.get("mtime") != pre_save_mtime:
+        logger.warning("No Phase 1 bake marker for this level, it will be rebaked next run")
+        return
+    write_bake_marker(marker_path, marker.get("key"), post_save_mtime, marker.get("mesh_count"), verified)
+
+
+def refresh_mesh_count_cache(bake_cache_dir, map_path: str, pre_save_mtime, post_save_mtime):
+    """Move the cached StaticMeshActor count onto the post-save mtime.
+    
+    The rebuild does not add or remove StaticMeshActors, so the count Phase 1 stored for
+    pre_save_mtime is still valid for the level this save produced.
+    """
+    cache_path = get_mesh_count_cache_path(bake_cache_dir)
+    cached = load_mesh_count_cache(cache_path).get(map_path)
+    if not cached or cached.get("mtime") != pre_save_mtime:
+        return
+    save_mesh_count_cache(cache_path, {map_path: {**cached, "mtime": post_save_mtime}})
+
+
 def main(argv=None) -> int:
     """Phase 2: Trigger NavMesh rebuild and verify after map is loaded via command line"""
     logger.info("Starting NavMesh rebuild and verification (Phase 2)...")
@@ -87,6 +128,10 @@ def main(argv=None) -> int:
     
     logger.info(f"Processing map: {map_path}")
     
+    # mtime of the level as Phase 1 left it, matched against the bake caches after the save
+    content_dir = unreal.Paths.project_content_dir()
+    pre_save_mtime = level_mtime(game_path_to_umap(content_dir, map_path))
+    
     try:
         # Get world
         try:
@@ -124,6 +169,13 @@ def main(argv=None) -> int:
             logger.error(f"Failed to save level: {e}")
             return 1
         
+        # The save changed the level mtime; carry the Phase 1 bake caches over to it
+        post_save_mtime = level_mtime(game_path_to_umap(content_dir, map_path))
+        if pre_save_mtime is not None and post_save_mtime is not None:
+            bake_cache_dir = get_bake_cache_dir(content_dir)
+            finalize_bake_marker(bake_cache_dir, map_path, pre_save_mtime, post_save_mtime, is_valid)
+            refresh_mesh_count_cache(bake_cache_dir, map_path, pre_save_mtime, post_save_mtime)
+        
         if is_valid:
             logger.info("Phase 2 completed successfully - NavMesh rebuilt, verified and saved")
             return 0
@@ -1,7 +1,6 @@
 
 import unreal
 import sys
-import json
 
 # 修正模块加载路径，确保 rendering.py 可用
 import os
@@ -23,20 +22,12 @@ def main(argv=None) -> int:
 
     argv = list(argv) if argv is not None else sys.argv
     env_key = "UE_RENDER_MANIFEST"
-    manifest_path = job_utils.resolve_manifest_path_from_env(env_key, argv)
-
-    if not manifest_path:
-        logger.error("No manifest path provided")
-        logger.info(f"sys.argv: {sys.argv}")
-        logger.info(f"Environment vars: {env_key}={os.environ.get(env_key)}")
-        return 1
-
-    logger.info(f"Manifest: {manifest_path}")
-
-    try:
-        manifest = job_utils.load_manifest(manifest_path)
-    except Exception as e:
-        logger.error(f"Failed to read manifest: {e}")
+    manifest, manifest_path = job_utils.parse_manifest_arg(env_key, argv)
+    if manifest is None:
+        if not manifest_path:
+            # The only clue when the launcher did not pass the manifest through
+            logger.info(f"sys.argv: {sys.argv}")
+            logger.info(f"Environment vars: {env_key}={os.environ.get(env_key)}")
         return 1
 
     job_id = manifest.get("job_id", "unknown")
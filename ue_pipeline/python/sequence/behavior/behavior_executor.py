@@ -8,10 +8,12 @@ import unreal
 from ...core import logger
 from ..navigation.nav_utils import (
     distance_cm,
+    distance_sq_cm,
     find_path_points,
     project_to_nav,
     random_reachable_point,
     find_connected_navmesh_start_point,
+    resample_by_count,
 )
 
 # Try to import connectivity analysis (optional)
@@ -337,6 +339,7 @@ def _execute_roam(
     min_radius_cm = float(cfg.get("min_radius_cm", 1000.0))
     max_attempts = int(cfg.get("max_random_point_tries", 20))
     min_leg_dist = float(cfg.get("min_leg_distance_cm", 300.0))
+    min_leg_dist_sq = min_leg_dist * min_leg_dist
     project = bool(cfg.get("project_to_nav", True))
     
     # Try to find a valid path
@@ -346,8 +349,7 @@ def _execute_roam(
             candidate = random_reachable_point(nav, world, context.position, min_radius_cm)
             
             # Check minimum distance
-            dist = distance_cm(context.position, candidate)
-            if dist < min_leg_dist:
+            if distance_sq_cm(context.position, candidate) < min_leg_dist_sq:
                 continue
             
             # Find NavMesh path
@@ -371,34 +373,12 @@ def _execute_roam(
                 # This ensures one point per frame, eliminating resampling errors
                 num_interpolated = duration_frames
                 
-                interpolated_points = []
-                for i in range(num_interpolated):
-                    t = float(i) / float(num_interpolated - 1) if num_interpolated > 1 else 0.0
-                    target_dist = t * path_distance
-                    
-                    # Find segment containing this distance
-                    accumulated_dist = 0.0
-                    for seg_idx in range(len(path_points) - 1):
-                        seg_dist = distance_cm(path_points[seg_idx], path_points[seg_idx + 1])
-                        if accumulated_dist + seg_dist >= target_dist:
-                            # Interpolate within this segment
-                            local_t = (target_dist - accumulated_dist) / seg_dist if seg_dist > 0 else 0.0
-                            p1 = path_points[seg_idx]
-                            p2 = path_points[seg_idx + 1]
-                            interp_point = unreal.Vector(
-                                p1.x + (p2.x - p1.x) * local_t,
-                                p1.y + (p2.y - p1.y) * local_t,
-                                p1.z + (p2.z - p1.z) * local_t,
-                            )
-                            interpolated_points.append(interp_point)
-                            break
-                        accumulated_dist += seg_dist
-                    else:
-                        # Fallback: use last point
-                        interpolated_points.append(path_points[-1])
-                
-                # Use interpolated points instead of raw path points
-                path_points = interpolated_points
+                # Single forward pass over the cumulative segment lengths instead of
+                # re-walking every segment for each frame
+                if num_interpolated >= 2:
+                    path_points = resample_by_count(path_points, num_interpolated)
+                else:
+                    path_points = path_points[:num_interpolated]
                 
                 # Calculate target yaw at the end (based on final trajectory direction)
                 if len(path_points) >= 2:
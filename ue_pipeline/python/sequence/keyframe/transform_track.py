@@ -53,26 +53,62 @@ def calculate_pitch_from_slope(a: unreal.Vector, b: unreal.Vector, pitch_range:
     return float(slope_angle)
 
 
+# Common add_key time argument forms across versions
+_ADD_KEY_TIME_FORMS = (
+    lambda frame: unreal.FrameNumber(frame),
+    lambda frame: frame,
+    lambda frame: unreal.FrameTime(unreal.FrameNumber(frame)),
+)
+
+# Index into _ADD_KEY_TIME_FORMS that the engine accepted; resolved on first use
+_add_key_form = None
+
+
 def channel_add_key(channel, frame: int, value):
     """Add a key on a scripting channel across UE API variants."""
+    global _add_key_form
     add_key = getattr(channel, "add_key", None)
     if not callable(add_key):
         raise RuntimeError("Channel has no add_key")
 
-    # Common call patterns across versions
-    for t in (
-        unreal.FrameNumber(int(frame)),
-        int(frame),
-        unreal.FrameTime(unreal.FrameNumber(int(frame))),
-    ):
+    frame = int(frame)
+    if _add_key_form is not None:
         try:
-            return add_key(t, value)
+            return add_key(_ADD_KEY_TIME_FORMS[_add_key_form](frame), value)
+        except Exception:
+            _add_key_form = None
+
+    for i, make_time in enumerate(_ADD_KEY_TIME_FORMS):
+        try:
+            key = add_key(make_time(frame), value)
         except Exception:
             continue
+        _add_key_form = i
+        return key
 
     raise RuntimeError("Failed to add key on channel (no compatible signature)")
 
 
+# mode -> candidate enum values, resolved once per mode instead of once per key
+_interp_values_by_mode = {}
+
+
+def _interp_values(mode: str) -> list:
+    mode_upper = (mode or "auto").upper()
+    values = _interp_values_by_mode.get(mode_upper)
+    if values is None:
+        values = []
+        for enum_name in (
+            "MovieSceneKeyInterpolation",
+            "MovieSceneKeyInterpolationMode",
+        ):
+            enum = getattr(unreal, enum_name, None)
+            if enum is not None and hasattr(enum, mode_upper):
+                values.append(getattr(enum, mode_upper))
+        _interp_values_by_mode[mode_upper] = values
+    return values
+
+
 def apply_key_interpolation(scripting_key, mode: str) -> None:
     """Apply interpolation mode to a scripting key."""
     if scripting_key is None:
@@ -83,23 +119,10 @@ def apply_key_interpolation(scripting_key, mode: str) -> None:
         return
 
     # Best-effort enum resolution
-    enum_candidates = []
-    for enum_name in (
-        "MovieSceneKeyInterpolation",
-        "MovieSceneKeyInterpolationMode",
-    ):
-        enum_candidates.append(getattr(unreal, enum_name, None))
-
-    enum_candidates = [e for e in enum_candidates if e is not None]
-    if not enum_candidates:
-        return
-
-    mode_upper = (mode or "auto").upper()
-    for enum in enum_candidates:
+    for value in _interp_values(mode):
         try:
-            if hasattr(enum, mode_upper):
-                set_interp(getattr(enum, mode_upper))
-                return
+            set_interp(value)
+            return
         except Exception:
             continue
 
@@ -6,6 +6,11 @@ import unreal
 from ...core import ue_api
 
 
+# Engine classes resolved once at import; None when this engine build lacks them
+_NAV_CLS = getattr(unreal, "NavigationSystemV1", None)
+_NAVMESH_BOUNDS_CLS = getattr(unreal, "NavMeshBoundsVolume", None)
+
+
 def distance_cm(a: unreal.Vector, b: unreal.Vector) -> float:
     dx = a.x - b.x
     dy = a.y - b.y
@@ -13,8 +18,16 @@ def distance_cm(a: unreal.Vector, b: unreal.Vector) -> float:
     return float(math.sqrt(dx * dx + dy * dy + dz * dz))
 
 
+def distance_sq_cm(a: unreal.Vector, b: unreal.Vector) -> float:
+    """Squared distance; use for threshold checks and ranking where the sqrt is not needed."""
+    dx = a.x - b.x
+    dy = a.y - b.y
+    dz = a.z - b.z
+    return dx * dx + dy * dy + dz * dz
+
+
 def get_nav_system(world):
-    nav_cls = getattr(unreal, "NavigationSystemV1", None)
+    nav_cls = _NAV_CLS
     if not nav_cls:
         raise RuntimeError("NavigationSystemV1 not available")
 
@@ -32,32 +45,57 @@ def get_nav_system(world):
     return nav_cls
 
 
+# Working UE call shape per helper, keyed by helper name: (use nav instance?, method name,
+# trailing None args). Found on the first successful call, then used directly instead of
+# probing every name/arity across the Python/UE boundary; dropped again if it raises.
+_RESOLVED = {}
+
+
+def _projected_point(result):
+    if isinstance(result, tuple) and len(result) >= 2:
+        success, projected = result[0], result[1]
+        if success and isinstance(projected, unreal.Vector):
+            return projected
+    if isinstance(result, unreal.Vector):
+        return result
+    return None
+
+
 def project_to_nav(nav, world, point: unreal.Vector) -> unreal.Vector:
+    resolved = _RESOLVED.get("project")
+    if resolved is not None:
+        use_nav, name, extra_args = resolved
+        target = nav if use_nav else (_NAV_CLS or object)
+        fn = getattr(target, name, None)
+        if callable(fn):
+            try:
+                projected = _projected_point(fn(world, point, *([None] * extra_args)))
+                return projected if projected is not None else point
+            except Exception:
+                pass
+        del _RESOLVED["project"]
+
     candidates = [
         (nav, ["project_point_to_navigation", "k2_project_point_to_navigation"]),
-        (getattr(unreal, "NavigationSystemV1", object), ["project_point_to_navigation", "k2_project_point_to_navigation"]),
+        (_NAV_CLS or object, ["project_point_to_navigation", "k2_project_point_to_navigation"]),
     ]
     arg_variants = [
         (world, point),
         (world, point, None),
         (world, point, None, None),
     ]
-    for target, method_names in candidates:
+    for use_nav, (target, method_names) in zip((True, False), candidates):
         for args in arg_variants:
-            last_err = None
             for name in method_names:
                 fn = getattr(target, name, None)
                 if callable(fn):
                     try:
-                        result = fn(*args)
-                        if isinstance(result, tuple) and len(result) >= 2:
-                            success, projected = result[0], result[1]
-                            if success and isinstance(projected, unreal.Vector):
-                                return projected
-                        if isinstance(result, unreal.Vector):
-                            return result
-                    except Exception as e:
-                        last_err = e
+                        projected = _projected_point(fn(*args))
+                    except Exception:
+                        continue
+                    if projected is not None:
+                        _RESOLVED["project"] = (use_nav, name, len(args) - 2)
+                        return projected
     return point
 
 
@@ -78,11 +116,36 @@ def random_reachable_point(nav, world, origin: unreal.Vector, radius_cm: float)
     raise RuntimeError(f"No reachable NavMesh point found near ({origin.x:.2f}, {origin.y:.2f}, {origin.z:.2f}) within {radius_cm:.0f}cm")
 
 
+# NavMeshBoundsVolume does not move during a sequence job; scan the level actors once per world
+_NAVMESH_BOUNDS_CACHE = {}
+
+
+def invalidate_navmesh_bounds_cache() -> None:
+    """Drop cached bounds, e.g. after (re)loading a map or editing its NavMeshBoundsVolume."""
+    _NAVMESH_BOUNDS_CACHE.clear()
+
+
 def get_navmesh_bounds(world) -> tuple:
+    try:
+        key = world.get_path_name()
+    except Exception:
+        key = None
+    if key is not None:
+        cached = _NAVMESH_BOUNDS_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    bounds = _scan_navmesh_bounds(world)
+    if bounds is not None and key is not None:
+        _NAVMESH_BOUNDS_CACHE[key] = bounds
+    return bounds
+
+
+def _scan_navmesh_bounds(world) -> tuple:
     try:
         actor_subsystem = ue_api.get_actor_subsystem()
         actors = actor_subsystem.get_all_level_actors()
-        navmesh_bounds_cls = getattr(unreal, "NavMeshBoundsVolume", None)
+        navmesh_bounds_cls = _NAVMESH_BOUNDS_CLS
         if not navmesh_bounds_cls:
             print("[WorkerCreateSequence] WARNING: NavMeshBoundsVolume class not found")
             return None
@@ -188,48 +251,83 @@ def find_connected_navmesh_start_point(nav, world, max_attempts: int = 10) -> un
 
 
 def find_path_points(nav, world, start: unreal.Vector, end: unreal.Vector):
-    candidates = [
-        (nav, ["find_path_to_location_synchronously"]),
-        (getattr(unreal, "NavigationSystemV1", object), ["find_path_to_location_synchronously"]),
-    ]
     nav_path = None
     last_err = None
-    arg_variants = [
-        (world, start, end),
-        (world, start, end, None),
-        (world, start, end, None, None),
-    ]
-    for target, method_names in candidates:
-        for args in arg_variants:
-            for name in method_names:
-                fn = getattr(target, name, None)
-                if callable(fn):
-                    try:
-                        nav_path = fn(*args)
-                        if nav_path:
-                            break
-                    except Exception as e:
-                        last_err = e
-        if nav_path:
-            break
+    resolved = _RESOLVED.get("find_path")
+    if resolved is not None:
+        # A resolved call that returns no path is a real "no path"; re-probe only if it raised
+        use_nav, name, extra_args = resolved
+        target = nav if use_nav else (_NAV_CLS or object)
+        try:
+            nav_path = getattr(target, name)(world, start, end, *([None] * extra_args))
+        except Exception as e:
+            last_err = e
+            del _RESOLVED["find_path"]
+            resolved = None
+
+    if resolved is None:
+        candidates = [
+            (nav, ["find_path_to_location_synchronously"]),
+            (_NAV_CLS or object, ["find_path_to_location_synchronously"]),
+        ]
+        arg_variants = [
+            (world, start, end),
+            (world, start, end, None),
+            (world, start, end, None, None),
+        ]
+        for use_nav, (target, method_names) in zip((True, False), candidates):
+            for args in arg_variants:
+                for name in method_names:
+                    fn = getattr(target, name, None)
+                    if callable(fn):
+                        try:
+                            nav_path = fn(*args)
+                            if nav_path:
+                                _RESOLVED["find_path"] = (use_nav, name, len(args) - 3)
+                                break
+                        except Exception as e:
+                            last_err = e
+                if nav_path:
+                    break
+            if nav_path:
+                break
 
     if not nav_path:
         raise RuntimeError(f"FindPathToLocationSynchronously failed: {last_err}")
 
+    accessor = _RESOLVED.get("path_points")
+    if accessor is not None:
+        try:
+            pts = list(accessor(nav_path))
+            if pts:
+                return pts
+        except Exception:
+            del _RESOLVED["path_points"]
+
     if hasattr(nav_path, "path_points"):
-        pts = list(getattr(nav_path, "path_points"))
+        pts = list(nav_path.path_points)
         if pts:
+            _RESOLVED["path_points"] = _path_points_attr
             return pts
 
     getter = getattr(nav_path, "get_path_points", None)
     if callable(getter):
         pts = list(getter())
         if pts:
+            _RESOLVED["path_points"] = _path_points_getter
             return pts
 
     return []
 
 
+def _path_points_attr(nav_path):
+    return nav_path.path_points
+
+
+def _path_points_getter(nav_path):
+    return nav_path.get_path_points()
+
+
 def resample_by_count(points, sample_count: int):
     if len(points) < 2:
         return points
@@ -245,27 +343,27 @@ def resample_by_count(points, sample_count: int):
 
     out = [points[0]]
     step = total / float(sample_count - 1)
-    target = step
-    seg = 1
-
-    while len(out) < sample_count - 1:
-        while seg < len(points) and dists[seg] < target:
-            seg += 1
-        if seg >= len(points):
-            break
-
-        d0 = dists[seg - 1]
-        d1 = dists[seg]
-        t = 0.0 if d1 <= d0 else (target - d0) / (d1 - d0)
-        a = points[seg - 1]
-        b = points[seg]
-        p = unreal.Vector(
-            a.x + (b.x - a.x) * t,
-            a.y + (b.y - a.y) * t,
-            a.z + (b.z - a.z) * t,
-        )
-        out.append(p)
-        target += step
+    n = len(points)
+    seg = 0  # end index of the current segment; 0 forces the first lookup
+
+    for k in range(1, sample_count - 1):
+        target = step * k
+        if dists[seg] < target:
+            while seg < n and dists[seg] < target:
+                seg += 1
+            if seg >= n:
+                break
+            # Dense samples share a segment, so its endpoints and deltas are set up once
+            a = points[seg - 1]
+            b = points[seg]
+            d0 = dists[seg - 1]
+            seg_len = dists[seg] - d0
+            dx = b.x - a.x
+            dy = b.y - a.y
+            dz = b.z - a.z
+
+        t = 0.0 if seg_len <= 0 else (target - d0) / seg_len
+        out.append(unreal.Vector(a.x + dx * t, a.y + dy * t, a.z + dz * t))
 
     out.append(points[-1])
     return out
@@ -284,7 +382,7 @@ def wait_for_navigation_ready(nav, world, timeout_seconds: float) -> None:
 
     fn = getattr(nav, "is_navigation_being_built_or_locked", None)
     if not callable(fn):
-        fn = getattr(getattr(unreal, "NavigationSystemV1", None), "is_navigation_being_built_or_locked", None)
+        fn = getattr(_NAV_CLS, "is_navigation_being_built_or_locked", None)
     if not callable(fn):
         return
 
@@ -324,10 +422,11 @@ def wait_for_navigation_ready(nav, world, timeout_seconds: float) -> None:
                 rebuild_fn = getattr(nav, "rebuild_all", None) or getattr(nav, "rebuild_navigation_data", None)
                 if callable(rebuild_fn):
                     rebuild_fn()
-                    print(f"[WorkerCreateSequence] Navigation rebuild triggered, waiting additional 5s...")
-                    # Wait additional time for rebuild
-                    time.sleep(5.0)
-                    # Check one more time
+                    print(f"[WorkerCreateSequence] Navigation rebuild triggered, waiting up to 5s...")
+                    # Poll the rebuild instead of sleeping the full 5s
+                    rebuild_deadline = time.time() + 5.0
+                    while fn(world) and time.time() < rebuild_deadline:
+                        time.sleep(0.25)
                     if not fn(world):
                         print(f"[WorkerCreateSequence] ✓ Navigation ready after rebuild")
                         return
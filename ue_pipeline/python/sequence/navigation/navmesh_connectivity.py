@@ -9,7 +9,7 @@ except ImportError:
     unreal = None
 
 from .nav_utils import (
-    distance_cm,
+    distance_sq_cm,
     project_to_nav,
     find_path_points,
     get_navmesh_bounds,
@@ -87,6 +87,7 @@ def find_largest_connected_region(nav, world, map_name, cache_dir, sample_count=
     
     samples = []
     max_attempts = sample_count * 3  # Allow some failures
+    max_projection_dist_sq = (extent.z * 2) ** 2
     attempts = 0
     
     while len(samples) < sample_count and attempts < max_attempts:
@@ -108,8 +109,7 @@ def find_largest_connected_region(nav, world, map_name, cache_dir, sample_count=
         projected = project_to_nav(nav, world, point)
         if projected:
             # Check if it's actually different from the input (successful projection)
-            dist = distance_cm(point, projected)
-            if dist < extent.z * 2:  # Reasonable projection distance
+            if distance_sq_cm(point, projected) < max_projection_dist_sq:  # Reasonable projection distance
                 samples.append(projected)
     
     if len(samples) < 2:
@@ -124,12 +124,11 @@ def find_largest_connected_region(nav, world, map_name, cache_dir, sample_count=
     successful_paths = 0
     
     for i in range(len(samples)):
-        # Find K nearest neighbors for this point
+        # Find K nearest neighbors for this point (squared distance ranks the same)
         distances = []
         for j in range(len(samples)):
             if i != j:
-                dist = distance_cm(samples[i], samples[j])
-                distances.append((dist, j))
+                distances.append((distance_sq_cm(samples[i], samples[j]), j))
         
         distances.sort()
         nearest = [j for _, j in distances[:k_nearest]]
@@ -258,7 +257,7 @@ def select_spawn_point_from_region(region_points, strategy="random", seed=None):
             sum(p.y for p in region_points) / len(region_points),
             sum(p.z for p in region_points) / len(region_points)
         )
-        spawn_point = min(region_points, key=lambda p: distance_cm(p, center))
+        spawn_point = min(region_points, key=lambda p: distance_sq_cm(p, center))
         print(f"[NavMesh] Selected center spawn point: ({spawn_point.x:.2f}, {spawn_point.y:.2f}, {spawn_point.z:.2f})")
     else:  # random
         if seed is not None:
@@ -290,6 +289,16 @@ def clear_cache(cache_dir, map_name=None):
         print(f"[NavMesh] Error clearing cache: {e}")
 
 
+# Largest connected region per (world, cache name, sample params); the analysis issues hundreds of
+# NavMesh path queries, so sequences after the first in a batch reuse the in-memory result
+_LARGEST_REGION_CACHE = {}
+
+
+def invalidate_region_cache():
+    """Drop cached regions, e.g. after (re)loading a map."""
+    _LARGEST_REGION_CACHE.clear()
+
+
 def get_spawn_point_with_connectivity(nav, world, map_path, cfg):
     """
     Get a spawn point using connectivity analysis if enabled, otherwise use legacy method.
@@ -335,15 +344,26 @@ def get_spawn_point_with_connectivity(nav, world, map_path, cfg):
         density_param = float(connectivity_sample_density) if connectivity_sample_density is not None else None
 
         print(f"[NavMesh] Using connectivity analysis (cache={cache_name}, sample_count={sample_count_param or 'auto'}, density={density_param or 'default'})")
-        largest_island = find_largest_connected_region(
-            nav,
-            world,
-            cache_name,
-            cache_dir,
-            sample_count=sample_count_param,
-            sample_density=density_param,
-            k_nearest=8,
-        )
+        try:
+            world_key = world.get_path_name()
+        except Exception:
+            world_key = None
+        region_key = (world_key, cache_name, sample_count_param, density_param, 8)
+        largest_island = _LARGEST_REGION_CACHE.get(region_key) if world_key is not None else None
+        if largest_island is not None:
+            print(f"[NavMesh] Reusing connectivity analysis from this run ({len(largest_island)} points)")
+        else:
+            largest_island = find_largest_connected_region(
+                nav,
+                world,
+                cache_name,
+                cache_dir,
+                sample_count=sample_count_param,
+                sample_density=density_param,
+                k_nearest=8,
+            )
+            if world_key is not None and largest_island:
+                _LARGEST_REGION_CACHE[region_key] = largest_island
 
         seed_for_spawn = cfg.get("seed", None)
         origin = select_spawn_point_from_region(largest_island, strategy="random", seed=seed_for_spawn)
@@ -28,11 +28,15 @@ from ue_pipeline.python.sequence.camera.camera_bindings import (
 from ue_pipeline.python.sequence.navigation.nav_utils import (
     distance_cm,
     get_nav_system,
+    invalidate_navmesh_bounds_cache,
     resample_by_count,
     wait_for_navigation_ready,
 )
 from ue_pipeline.python.sequence.behavior.behavior_executor import generate_behavior_sequence
-from ue_pipeline.python.sequence.navigation.navmesh_connectivity import get_spawn_point_with_connectivity
+from ue_pipeline.python.sequence.navigation.navmesh_connectivity import (
+    get_spawn_point_with_connectivity,
+    invalidate_region_cache,
+)
 from ue_pipeline.python.sequence.keyframe.transform_track import (
     calculate_pitch_from_slope,
     sanitize_rotation_keys,
@@ -210,6 +214,8 @@ def _prepare_sequence_generation_run(
         except Exception as e:
             logger.error(f"Map load failed: {e}")
             raise
+        invalidate_navmesh_bounds_cache()
+        invalidate_region_cache()
 
     ensure_directory_exists(output_dir)
 
@@ -1045,17 +1051,8 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     argv = list(argv) if argv is not None else sys.argv[1:]
     
-    manifest_path = job_utils.resolve_manifest_path_from_env("UE_MANIFEST_PATH", argv)
-    if not manifest_path:
-        logger.error("No manifest path provided")
-        return 1
-
-    logger.info(f"Manifest: {manifest_path}")
-
-    try:
-        manifest = job_utils.load_manifest(manifest_path)
-    except Exception as e:
-        logger.error(str(e))
+    manifest, _ = job_utils.parse_manifest_arg("UE_MANIFEST_PATH", argv)
+    if manifest is None:
         return 1
 
     job_id = manifest.get("job_id", "unknown")
@@ -7,11 +7,18 @@
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
 from threading import Lock
 
 
+# 大对象分片并发下载参数
+RANGE_DOWNLOAD_THRESHOLD = 32 * 1024 * 1024  # 超过32MB的对象使用Range分片下载
+RANGE_PART_SIZE = 8 * 1024 * 1024  # 每个分片8MB
+RANGE_MAX_WORKERS = 8  # 分片并发数
+
+
 class BosClientManager:
     """BOS客户端管理器（单例模式）"""
     
@@ -190,12 +197,80 @@ class BosClientManager:
     
     # ========== 便捷的BOS操作方法 ==========
     
-    def download(self, bucket_name: str, object_key: str, file_name: str):
-        """下载对象到文件"""
+    def download(self, bucket_name: str, object_key: str, file_name: str,
+                 size: Optional[int] = None, make_dirs: bool = True):
+        """
+        下载对象到文件
+        
+        如果提供了对象大小且超过 RANGE_DOWNLOAD_THRESHOLD，使用Range分片并发下载。
+        调用方已预先创建好目录时传 make_dirs=False，跳过逐文件的 makedirs。
+        """
         dir_name = os.path.dirname(file_name)
-        if dir_name:
+        if make_dirs and dir_name:
             os.makedirs(dir_name, exist_ok=True)
-        self.client.get_object_to_file(bucket_name, object_key, file_name)
+        
+        if size is not None and size > RANGE_DOWNLOAD_THRESHOLD:
+            self.download_ranged(bucket_name, object_key, file_name, size)
+        else:
+            self.client.get_object_to_file(bucket_name, object_key, file_name)
+    
+    def download_ranged(self, bucket_name: str, object_key: str, file_name: str, size: int,
+                        part_size: int = RANGE_PART_SIZE,
+                        max_workers: int = RANGE_MAX_WORKERS):
+        """
+        按Range分片并发下载大对象
+        
+        单个TCP连接受拥塞窗口限制，多个并发GET能更快占满带宽。
+        先在 <file_name>.part 预分配文件大小，各分片按偏移量直接写入对应位置；
+        全部分片成功后才 os.replace 到目标路径，失败时删除临时文件，
+        避免留下大小正确但含零填充空洞的文件被后续运行当作已下载跳过。
+        
+        Args:
+            bucket_name: BOS bucket名称
+            object_key: 对象key
+            file_name: 本地文件路径
+            size: 对象大小（字节）
+            part_size: 分片大小（字节）
+            max_workers: 并发数
+        """
+        ranges = [(start, min(start + part_size, size) - 1)
+                  for start in range(0, size, part_size)]
+        part_file = file_name + '.part'
+        
+        try:
+            with open(part_file, 'wb') as f:
+                f.truncate(size)
+            
+            with open(part_file, 'r+b') as f:
+                fd = f.fileno()
+                write_lock = Lock()
+                
+                def fetch_part(part_range):
+                    start, end = part_range
+                    data = self.client.get_object_as_string(
+                        bucket_name, object_key, range=[start, end]
+                    )
+                    if len(data) != end - start + 1:
+                        raise IOError(f"分片长度不符: {object_key} [{start}-{end}] 收到 {len(data)} 字节")
+                    if hasattr(os, 'pwrite'):
+                        os.pwrite(fd, data, start)
+                    else:
+                        # Windows 没有 pwrite，退化为加锁的 seek + write
+                        with write_lock:
+                            f.seek(start)
+                            f.write(data)
+                
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # list() 触发迭代，任一分片失败都会在此抛出异常
+                    list(executor.map(fetch_part, ranges))
+            
+            os.replace(part_file, file_name)
+        except BaseException:
+            try:
+                os.unlink(part_file)
+            except OSError:
+                pass
+            raise
     
     def upload(self, bucket_name: str, object_key: str, file_name: str):
         """上传文件到BOS"""
@@ -214,6 +289,39 @@ class BosClientManager:
         """列出对象"""
         return [o.key for o in self.client.list_all_objects(bucket_name, prefix=prefix)]
     
+    def iter_prefix_pages(self, bucket_name: str, prefix: str = '', delimiter: str = '/'):
+        """
+        逐页列出前缀下的一级"目录"（CommonPrefixes）
+        
+        每返回一页即产出该页的前缀列表，调用方可以边列出边处理
+        """
+        marker = None
+        while True:
+            response = self.client.list_objects(
+                bucket_name=bucket_name,
+                prefix=prefix,
+                delimiter=delimiter,
+                marker=marker
+            )
+            yield [cp.prefix for cp in (response.common_prefixes or [])]
+            
+            if response.is_truncated:
+                marker = response.next_marker
+            else:
+                break
+    
+    def list_prefixes(self, bucket_name: str, prefix: str = '', delimiter: str = '/') -> List[str]:
+        """
+        列出前缀下的一级"目录"（CommonPrefixes），自动分页
+        
+        Returns:
+            完整前缀列表，如 ['raw/Scene1/', 'raw/Scene2/']
+        """
+        prefixes = []
+        for page in self.iter_prefix_pages(bucket_name, prefix, delimiter):
+            prefixes.extend(page)
+        return prefixes
+    
     def exists(self, bucket_name: str, prefix: str) -> bool:
         """检查对象是否存在"""
         try:
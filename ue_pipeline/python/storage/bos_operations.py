@@ -8,29 +8,53 @@ BOS统一操作管理器
 """
 
 import argparse
-import json
+import os
 import sys
 from pathlib import Path
 from typing import Optional
 
-# 添加当前目录到路径
-sys.path.insert(0, str(Path(__file__).parent))
+from .bos_client import get_bos_manager, initialize_bos
+from .scene_copy import BosSceneCopier
+from .scene_download import BosSceneDownloader
+from .scene_upload import main as upload_main
+from .storage_config import load_json_config
 
 
 def load_config(config_path: str) -> dict:
-    """加载配置文件"""
+    """加载配置文件（同一文件只解析一次）"""
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_config(config_path)
     except Exception as e:
         print(f"✗ 加载配置文件失败: {e}")
         sys.exit(1)
 
 
+def setup_bos_client(config: dict) -> None:
+    """
+    初始化全局BOS客户端（每次运行只执行一次）
+    
+    所有操作共享同一个客户端及其连接，不再为每个操作/场景重复设置凭证
+    """
+    if get_bos_manager().is_available:
+        return
+    
+    creds = config.get('credentials', {})
+    try:
+        if creds.get('access_key_id') and creds.get('secret_access_key'):
+            initialize_bos(
+                access_key_id=creds['access_key_id'],
+                secret_access_key=creds['secret_access_key'],
+                endpoint=creds.get('endpoint', 'bj.bcebos.com')
+            )
+        else:
+            initialize_bos()
+    except ImportError as e:
+        # 未安装SDK时各操作回退到 bcecmd
+        print(f"⚠ BOS SDK 初始化失败: {e}")
+
+
 def run_copy_operation(config: dict, dry_run: bool = False) -> int:
     """执行复制操作"""
-    from bos_copy_scenes import BosSceneCopier
-    
     op_config = config['operations']['copy']
     
     print("\n" + "="*70)
@@ -56,6 +80,8 @@ def run_copy_operation(config: dict, dry_run: bool = False) -> int:
     copier.exclude_patterns = op_config.get('exclude_patterns', ['manifest', '*.url', '*.txt', '*.md'])
     copier.prefer_duplicated_scene_name = op_config.get('prefer_duplicated_scene_name', True)
     copier.skip_existing = op_config.get('skip_existing', True)
+    copier.thread_num = op_config.get('thread_num', copier.thread_num)
+    copier.multipart_thread_num = op_config.get('multipart_thread_num', copier.multipart_thread_num)
     
     # 获取场景列表
     scenes = op_config.get('scenes', [])
@@ -81,7 +107,7 @@ def run_copy_operation(config: dict, dry_run: bool = False) -> int:
     
     for i, scene in enumerate(scenes, 1):
         print(f"\n[{i}/{len(scenes)}] 处理场景: {scene}")
-        success = copier.copy_scene(scene, dry_run=is_dry_run)
+        success = copier.process_scene(scene, dry_run=is_dry_run)
         
         if not success:
             failed_scenes.append(scene)
@@ -98,8 +124,6 @@ def run_copy_operation(config: dict, dry_run: bool = False) -> int:
 
 def run_upload_operation(config: dict, dry_run: bool = False) -> int:
     """执行上传操作"""
-    from python.bos.upload_scenes import main as upload_main
-    
     op_config = config['operations']['upload']
     
     print("\n" + "="*70)
@@ -109,47 +133,25 @@ def run_upload_operation(config: dict, dry_run: bool = False) -> int:
     print(f"模式: {'预览模式' if dry_run or op_config.get('dry_run') else '实际上传'}")
     print("="*70 + "\n")
     
-    # 准备命令行参数
-    import os
-    
-    # 设置环境变量
-    if 'ue_config_path' in op_config:
-        os.environ['UE_CONFIG_PATH'] = op_config['ue_config_path']
-    
-    # 设置BOS凭证环境变量
-    if 'credentials' in config:
-        creds = config['credentials']
-        os.environ['BCE_ACCESS_KEY_ID'] = creds.get('access_key_id', '')
-        os.environ['BCE_SECRET_ACCESS_KEY'] = creds.get('secret_access_key', '')
-        os.environ['BCE_ENDPOINT'] = creds.get('endpoint', 'bj.bcebos.com')
-    
-    # 构建命令行参数
-    old_argv = sys.argv.copy()
-    sys.argv = ['upload_scenes.py']
-    
-    if dry_run or op_config.get('dry_run'):
-        sys.argv.append('--dry-run')
-    
-    if op_config.get('force_upload'):
-        sys.argv.append('--force')
-    
-    if op_config.get('upload_only_baked'):
-        sys.argv.append('--only-baked')
+    # 直接构建参数对象，不修改 sys.argv
+    args = argparse.Namespace(
+        config=op_config.get('ue_config_path') or os.environ.get('UE_CONFIG_PATH', 'ue_pipeline/config/ue_config.json'),
+        bos_config=op_config.get('bos_config_path', 'ue_pipeline/config/bos_config.json'),
+        bucket=op_config['target_bucket'],
+        db=op_config.get('db_path', 'database/scene_registry.db'),
+        dry_run=bool(dry_run or op_config.get('dry_run')),
+        scene=op_config.get('scene'),
+    )
     
     try:
-        result = upload_main()
-        sys.argv = old_argv
-        return result
+        return upload_main(args)
     except Exception as e:
         print(f"✗ 上传失败: {e}")
-        sys.argv = old_argv
         return 1
 
 
 def run_download_operation(config: dict, dry_run: bool = False) -> int:
     """执行下载操作"""
-    from bos_download_scene import BosSceneDownloader
-    
     op_config = config['operations']['download']
     
     print("\n" + "="*70)
@@ -166,6 +168,8 @@ def run_download_operation(config: dict, dry_run: bool = False) -> int:
         source_prefix=op_config['source_prefix'],
         local_content_path=op_config.get('local_content_path') or None
     )
+    downloader.thread_num = op_config.get('thread_num', downloader.thread_num)
+    downloader.multipart_thread_num = op_config.get('multipart_thread_num', downloader.multipart_thread_num)
     
     # 如果提供了UE配置路径，加载Content路径
     if op_config.get('ue_config_path') and not downloader.local_content_path:
@@ -225,6 +229,14 @@ def run_download_operation(config: dict, dry_run: bool = False) -> int:
         return 0
 
 
+# 操作名 -> 执行函数
+_OPERATIONS = {
+    'copy': run_copy_operation,
+    'upload': run_upload_operation,
+    'download': run_download_operation,
+}
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(
@@ -243,19 +255,19 @@ def main():
 
 示例:
   # 使用默认配置文件执行active_operation指定的操作
-  python bos_manager.py
+  python -m ue_pipeline.python.storage.bos_operations
   
   # 使用自定义配置文件
-  python bos_manager.py -c config/my_bos_config.json
+  python -m ue_pipeline.python.storage.bos_operations -c config/my_bos_config.json
   
   # 覆盖配置文件中的active_operation
-  python bos_manager.py --operation download
+  python -m ue_pipeline.python.storage.bos_operations --operation download
   
   # 预览模式
-  python bos_manager.py --dry-run
+  python -m ue_pipeline.python.storage.bos_operations --dry-run
   
   # 列出可用操作
-  python bos_manager.py --list-operations
+  python -m ue_pipeline.python.storage.bos_operations --list-operations
         """
     )
     
@@ -334,15 +346,13 @@ def main():
     print(f"\n执行操作: {operation}")
     print(f"配置文件: {config_path}")
     
-    if operation == 'copy':
-        return run_copy_operation(config, args.dry_run)
-    elif operation == 'upload':
-        return run_upload_operation(config, args.dry_run)
-    elif operation == 'download':
-        return run_download_operation(config, args.dry_run)
-    else:
+    setup_bos_client(config)
+    
+    handler = _OPERATIONS.get(operation)
+    if handler is None:
         print(f"✗ 未知操作: {operation}")
         return 1
+    return handler(config, args.dry_run)
 
 
 if __name__ == '__main__':
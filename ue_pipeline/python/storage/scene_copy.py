@@ -12,6 +12,8 @@ import re
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+from .storage_config import BCECMD_MULTIPART_THREAD_NUM, BCECMD_THREAD_NUM, bcecmd_parallel_args
+
 
 class BosSceneCopier:
     """BOS场景复制器"""
@@ -43,6 +45,8 @@ class BosSceneCopier:
             self.exclude_patterns = config.get('exclude_patterns', ['manifest', '*.url', '*.txt', '*.md'])
             self.prefer_duplicated_scene_name = config.get('prefer_duplicated_scene_name', True)
             self.skip_existing = config.get('skip_existing', True)
+            self.thread_num = config.get('thread_num', BCECMD_THREAD_NUM)
+            self.multipart_thread_num = config.get('multipart_thread_num', BCECMD_MULTIPART_THREAD_NUM)
         else:
             # 使用命令行参数或默认值
             self.source_bucket = source_bucket or 'baidu-download-new'
@@ -54,6 +58,8 @@ class BosSceneCopier:
             self.exclude_patterns = ['manifest', '*.url', '*.txt', '*.md']
             self.prefer_duplicated_scene_name = True
             self.skip_existing = True
+            self.thread_num = BCECMD_THREAD_NUM
+            self.multipart_thread_num = BCECMD_MULTIPART_THREAD_NUM
     
     def load_config(self, config_path: str) -> dict:
         """加载配置文件"""
@@ -451,6 +457,7 @@ class BosSceneCopier:
             
             # 使用 bcecmd bos cp 递归复制
             cmd = ['bcecmd', 'bos', 'cp', source_path, target_path, '-r', '-y']
+            cmd += bcecmd_parallel_args(self.thread_num, self.multipart_thread_num)
             print(f"\n复制: {source_path}")
             print(f"  -> {target_path}")
             print(f"执行命令: {' '.join(cmd)}")
@@ -4,13 +4,95 @@ BOS场景下载工具
 从 bos://world-data/raw/场景名/Content/ 下载到本地UE工程的Content目录
 """
 
+import hashlib
+import mmap
+import os
+import re
 import subprocess
 import sys
-import json
+import threading
+import time
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
+from .bos_client import get_bos_manager, RANGE_DOWNLOAD_THRESHOLD
+from .storage_config import DownloadOpConfig, bcecmd_parallel_args, load_json_config
+
+# 场景列表缓存有效期（秒）
+SCENE_CACHE_TTL = 60
+
+# 小对象并发下载线程数
+DOWNLOAD_MAX_WORKERS = 16
+
+# 单次上传对象的ETag即内容MD5；分片上传的ETag不是MD5，无法用于校验
+_MD5_ETAG = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _stream_command(cmd: list, timeout: float, on_line) -> tuple[int, str]:
+    """
+    执行命令并逐行回调输出，不在内存中缓冲完整stdout
+    
+    stderr 合并到 stdout，避免两个管道互相阻塞。
+    
+    Args:
+        cmd: 命令参数列表
+        timeout: 超时时间（秒），超时后终止进程
+        on_line: 每行输出的回调函数
+    
+    Returns:
+        (返回码, 最后几行输出)
+    
+    Raises:
+        subprocess.TimeoutExpired: 命令超时
+    """
+    tail = deque(maxlen=5)
+    timed_out = threading.Event()
+    
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding='utf-8',
+        errors='ignore'
+    )
+    
+    def kill():
+        timed_out.set()
+        proc.kill()
+    
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            tail.append(line)
+            on_line(line)
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+    
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    
+    return returncode, ''.join(tail).strip()
+
+
+def _file_md5(path: Path) -> str:
+    """
+    计算文件MD5
+    
+    通过 mmap 映射整个文件交给 hashlib，避免逐块 read 的系统调用和中间拷贝
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.md5().hexdigest()  # 空文件无法 mmap
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.md5(mm).hexdigest()
+
 
 class BosSceneDownloader:
     """BOS场景下载器"""
@@ -30,29 +112,40 @@ class BosSceneDownloader:
             source_prefix: 源路径前缀（raw）
             local_content_path: 本地Content目录路径
         """
-        # 如果提供了配置文件，从配置文件加载
+        # 全局BOS客户端（已初始化时使用SDK下载，否则回退到 bcecmd）
+        self.bos = get_bos_manager()
+        
+        # 场景列表缓存，避免同一会话内重复执行 bcecmd ls
+        self._scene_cache = None
+        self._scene_cache_ts = 0.0
+        self._scene_lower_map = {}  # {小写场景名: 场景名}，与场景列表缓存同步更新
+        
+        # 预解析下载配置：配置文件优先，否则使用传入参数
         if config_path:
-            config = self.load_config(config_path)
-            self.source_bucket = config.get('source_bucket', 'world-data')
-            self.source_prefix = config.get('source_prefix', 'raw').strip('/')
-            self.local_content_path = Path(config.get('local_content_path', '')) if config.get('local_content_path') else None
-            self.configured_scenes = config.get('scenes', [])  # 从配置读取场景列表
-            
-            # 如果配置文件中指定了 ue_config_path，使用它来获取 Content 路径
-            if not self.local_content_path and config.get('ue_config_path'):
-                ue_config_path = config.get('ue_config_path')
-                # 相对路径转绝对路径
-                if not Path(ue_config_path).is_absolute():
-                    config_dir = Path(config_path).parent.parent  # 从 ue_pipeline/config 向上到工作区根目录
-                    ue_config_path = str(config_dir / ue_config_path)
-                # 不再在这里设置 ue_config_path 参数，而是在下面统一处理
-                if not ue_config_path:  # 避免覆盖外部传入的参数
-                    ue_config_path = ue_config_path
+            op_config = DownloadOpConfig.from_dict(self.load_config(config_path))
         else:
-            self.source_bucket = source_bucket or 'world-data'
-            self.source_prefix = (source_prefix or 'raw').strip('/')
-            self.local_content_path = Path(local_content_path) if local_content_path else None
-            self.configured_scenes = []
+            op_config = DownloadOpConfig.from_dict({
+                'source_bucket': source_bucket,
+                'source_prefix': source_prefix,
+                'local_content_path': local_content_path,
+            })
+        
+        self.source_bucket = op_config.source_bucket
+        self.source_prefix = op_config.source_prefix
+        self.local_content_path = Path(op_config.local_content_path) if op_config.local_content_path else None
+        self.configured_scenes = list(op_config.scenes)  # 从配置读取场景列表
+        self.skip_existing = op_config.skip_existing
+        self.verify_existing = op_config.verify_existing
+        self.thread_num = op_config.thread_num
+        self.multipart_thread_num = op_config.multipart_thread_num
+        
+        # 如果配置文件中指定了 ue_config_path，使用它来获取 Content 路径
+        if config_path and not self.local_content_path and op_config.ue_config_path:
+            ue_config_path = op_config.ue_config_path
+            # 相对路径转绝对路径
+            if not Path(ue_config_path).is_absolute():
+                config_dir = Path(config_path).parent.parent  # 从 ue_pipeline/config 向上到工作区根目录
+                ue_config_path = str(config_dir / ue_config_path)
         
         # 如果提供了UE配置文件，从中提取Content路径
         if ue_config_path and not self.local_content_path:
@@ -106,10 +199,9 @@ class BosSceneDownloader:
                 print(f"✗ 未找到默认UE配置: {default_ue_config}")
     
     def load_config(self, config_path: str) -> dict:
-        """加载配置文件"""
+        """加载配置文件（同一文件只解析一次）"""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json_config(config_path)
         except Exception as e:
             print(f"✗ 加载配置文件失败: {e}")
             return {}
@@ -118,34 +210,50 @@ class BosSceneDownloader:
         """
         列出BOS中可用的场景（只扫描一级目录，不递归）
         
+        优先使用BOS SDK按 delimiter 分页列出，未初始化SDK时回退到 bcecmd
+        
         Returns:
             场景名称列表 ['scene1', 'scene2', ...]
         """
+        if self._scene_cache is not None and time.monotonic() - self._scene_cache_ts < SCENE_CACHE_TTL:
+            return list(self._scene_cache)
+        
+        if self.bos.is_available:
+            scene_names = self._list_scenes_sdk()
+        else:
+            scene_names = self._list_scenes_bcecmd()
+        
+        if scene_names is None:
+            return []
+        
+        self._scene_cache = scene_names
+        self._scene_cache_ts = time.monotonic()
+        self._scene_lower_map = {s.lower(): s for s in scene_names}
+        return list(scene_names)
+    
+    def _list_scenes_sdk(self) -> Optional[list]:
+        """使用BOS SDK列出场景，失败返回None"""
+        try:
+            prefixes = self.bos.list_prefixes(self.source_bucket, f"{self.source_prefix}/")
+            return [p.rstrip('/').split('/')[-1] for p in prefixes]
+        except Exception as e:
+            print(f"✗ 列出场景失败: {e}")
+            return None
+    
+    def _list_scenes_bcecmd(self) -> Optional[list]:
+        """使用 bcecmd 列出场景，失败返回None"""
         bos_path = f"bos:/{self.source_bucket}/{self.source_prefix}/"
         
         try:
             cmd = ['bcecmd', 'bos', 'ls', bos_path, '-a']
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                timeout=10  # 快速超时
-            )
-            
-            if result.returncode != 0:
-                print(f"✗ 列出场景失败: {result.stderr}")
-                return []
-            
             # 解析输出，获取场景名称（只扫描一级目录）
             scene_names = []
-            lines = result.stdout.strip().split('\n')
             
-            for line in lines:
+            def collect(line):
                 line = line.strip()
                 if not line or line.startswith('TOTAL'):
-                    continue
+                    return
                 
                 if line.endswith('/'):
                     scene_name = line.rstrip('/')
@@ -154,17 +262,29 @@ class BosSceneDownloader:
                         scene_name = scene_name[5:]
                     scene_names.append(scene_name)
             
+            returncode, output_tail = _stream_command(cmd, 10, collect)  # 快速超时
+            
+            if returncode != 0:
+                print(f"✗ 列出场景失败: {output_tail}")
+                return None
+            
             return scene_names
             
         except subprocess.TimeoutExpired:
             print("✗ 列出场景超时")
-            return []
+            return None
         except FileNotFoundError:
             print("✗ 未找到 bcecmd 命令")
-            return []
+            return None
         except Exception as e:
             print(f"✗ 列出场景失败: {e}")
-            return []
+            return None
+    
+    def invalidate_scene_cache(self):
+        """清除场景列表缓存（在源路径上传/复制后调用）"""
+        self._scene_cache = None
+        self._scene_cache_ts = 0.0
+        self._scene_lower_map = {}
     
     def search_scene(self, scene_name: str) -> bool:
         """
@@ -184,11 +304,10 @@ class BosSceneDownloader:
             return False
         
         # 检查场景是否存在（不区分大小写）
-        scene_exists = any(s.lower() == scene_name.lower() for s in all_scenes)
+        matched_scene = self._scene_lower_map.get(scene_name.lower())
         
-        if scene_exists:
+        if matched_scene:
             # 找到精确匹配
-            matched_scene = next(s for s in all_scenes if s.lower() == scene_name.lower())
             print(f"\n✓ 找到场景: {matched_scene}")
             return True
         else:
@@ -200,7 +319,7 @@ class BosSceneDownloader:
             
             if first_letter:
                 # 筛选首字母相同的场景
-                similar_scenes = [s for s in all_scenes if s[0].upper() == first_letter]
+                similar_scenes = [s for s in all_scenes if s[:1].upper() == first_letter]
                 
                 if similar_scenes:
                     print(f"\n以 '{first_letter}' 开头的场景:")
@@ -294,34 +413,24 @@ class BosSceneDownloader:
             print(f"[预览模式] 将执行下载")
             return True
         
+        if self.bos.is_available:
+            return self._download_scene_sdk(scene_name, target_scene_path)
+        
         try:
-            # 检查源路径是否存在
-            check_cmd = ['bcecmd', 'bos', 'ls', source_path]
-            check_result = subprocess.run(
-                check_cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8'
-            )
+            # 单次递归列出：同时用于检查源路径是否存在和统计文件数量
+            check_cmd = ['bcecmd', 'bos', 'ls', source_path, '-r']
+            file_count = 0
             
-            if check_result.returncode != 0:
-                print(f"✗ 源路径不存在: {source_path}")
-                return False
+            def count_line(line):
+                nonlocal file_count
+                if line.strip() and not line.startswith('TOTAL'):
+                    file_count += 1
             
-            # 获取详细文件列表统计
-            check_cmd = ['bcecmd', 'bos', 'ls', source_path, '-r']
-            check_result = subprocess.run(
-                check_cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                timeout=30
-            )
+            returncode, _ = _stream_command(check_cmd, 30, count_line)
             
-            # 统计文件数量
-            lines = [l.strip() for l in check_result.stdout.strip().split('\n') 
-                    if l.strip() and not l.startswith('TOTAL')]
-            file_count = len(lines)
+            if returncode != 0:
+                print(f"✗ 源路径不存在: {source_path}")
+                return False
             
             if file_count == 0:
                 print(f"✗ 源路径为空")
@@ -330,9 +439,10 @@ class BosSceneDownloader:
             print(f"✓ 源路径包含 {file_count} 个对象")
             
             # 使用 bcecmd 下载整个场景文件夹（显示进度）
-            # bcecmd bos cp bos:/bucket/prefix/scene/ local/Content/scene/ -r -y
+            # bcecmd bos cp bos:/bucket/prefix/scene/ local/Content/scene/ -r -y --thread-num N
             target_str = str(target_scene_path.absolute()).replace('\\', '/')
             cmd = ['bcecmd', 'bos', 'cp', source_path, target_str, '-r', '-y']
+            cmd += bcecmd_parallel_args(self.thread_num, self.multipart_thread_num)
             
             print(f"\n执行命令: {' '.join(cmd)}")
             print(f"\n开始下载...\n")
@@ -354,7 +464,194 @@ class BosSceneDownloader:
         except Exception as e:
             print(f"\n✗ 下载失败: {e}")
             return False
-
+    
+    def iter_scene_objects(self, scene_name: str):
+        """
+        逐页列出场景下的对象（跳过目录占位对象）
+        
+        每页列表返回后立即产出其中的对象，调用方可以边列出边下载
+        """
+        prefix = f"{self.source_prefix}/{scene_name}/"
+        for obj in self.bos.client.list_all_objects(self.source_bucket, prefix=prefix):
+            if not obj.key.endswith('/'):
+                yield obj
+    
+    def _download_scene_sdk(self, scene_name: str, target_scene_path: Path) -> bool:
+        """
+        使用BOS SDK下载场景
+        
+        列表分页与下载重叠：每列出一页就把其中的小对象提交到线程池，
+        不再先完整列出统计一遍再下载。大对象在列表结束后逐个按Range分片并发下载。
+        
+        Args:
+            scene_name: 场景名称
+            target_scene_path: 本地场景目录
+            
+        Returns:
+            是否成功
+        """
+        prefix = f"{self.source_prefix}/{scene_name}/"
+        
+        # 跳过本地已存在且内容一致的文件（一次遍历本地目录，避免逐个stat）
+        existing_sizes = {}
+        if self.skip_existing and target_scene_path.exists():
+            existing_sizes = self._scan_local_sizes(target_scene_path)
+        
+        def download_object(obj) -> bool:
+            """下载单个对象，返回False表示本地已是最新而跳过"""
+            if existing_sizes and self._is_local_copy_current(obj, prefix, target_scene_path, existing_sizes):
+                return False
+            local_file = target_scene_path / obj.key[len(prefix):]
+            self.bos.download(self.source_bucket, obj.key, str(local_file),
+                              size=obj.size, make_dirs=False)
+            return True
+        
+        # 目录在主线程按需创建，每个目录只 mkdir 一次，下载线程不再逐文件 makedirs
+        # 本地已有文件所在的目录必然存在，直接记为已创建
+        created_dirs = {os.path.dirname(path) for path in existing_sizes}
+        
+        def ensure_parent_dir(obj) -> None:
+            relative_dir = os.path.dirname(obj.key[len(prefix):])
+            if relative_dir not in created_dirs:
+                (target_scene_path / relative_dir).mkdir(parents=True, exist_ok=True)
+                created_dirs.add(relative_dir)
+        
+        try:
+            print(f"\n开始下载...\n")
+            
+            total_count = 0
+            total_size = 0
+            downloaded = 0
+            skipped = 0
+            failed = []
+            large_objects = []
+            
+            # 线程池在第一个需要下载的小对象出现时才创建，全部已是最新时不创建
+            executor = None
+            futures = {}
+            try:
+                for obj in self.iter_scene_objects(scene_name):
+                    total_count += 1
+                    total_size += obj.size
+                    # 大小一致且无需校验内容的文件在列表线程直接跳过，不进入下载流程
+                    if (existing_sizes.get(obj.key[len(prefix):]) == obj.size
+                            and not self._needs_content_check(obj)):
+                        skipped += 1
+                        continue
+                    ensure_parent_dir(obj)
+                    if obj.size > RANGE_DOWNLOAD_THRESHOLD:
+                        large_objects.append(obj)
+                    else:
+                        if executor is None:
+                            executor = ThreadPoolExecutor(max_workers=DOWNLOAD_MAX_WORKERS)
+                        futures[executor.submit(download_object, obj)] = obj
+                
+                if total_count == 0:
+                    print(f"✗ 源路径为空")
+                    return False
+                
+                print(f"✓ 源路径包含 {total_count} 个对象 ({total_size / 1024 / 1024:.2f} MB)")
+                
+                if not futures and not large_objects:
+                    print(f"\n✓ 场景已是最新，无需下载 (跳过 {skipped} 个本地已存在的文件)")
+                    return True
+                
+                done = skipped
+                for future in as_completed(futures):
+                    obj = futures[future]
+                    done += 1
+                    try:
+                        if future.result():
+                            downloaded += 1
+                            print(f"  [{done}/{total_count}] {obj.key[len(prefix):]}")
+                        else:
+                            skipped += 1
+                    except Exception as e:
+                        failed.append(obj.key)
+                        print(f"  [{done}/{total_count}] ✗ {obj.key[len(prefix):]}: {e}")
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True)
+            
+            # 大对象在主线程逐个下载（内部已按Range分片并发）
+            for obj in large_objects:
+                done += 1
+                try:
+                    if download_object(obj):
+                        downloaded += 1
+                        print(f"  [{done}/{total_count}] {obj.key[len(prefix):]} ({obj.size / 1024 / 1024:.2f} MB, 分片下载)")
+                    else:
+                        skipped += 1
+                except Exception as e:
+                    failed.append(obj.key)
+                    print(f"  [{done}/{total_count}] ✗ {obj.key[len(prefix):]}: {e}")
+            
+            if skipped:
+                print(f"\n✓ 跳过 {skipped} 个本地已存在的文件")
+            
+            if failed:
+                print(f"\n✗ {len(failed)} 个对象下载失败")
+                return False
+            
+            if downloaded == 0:
+                print(f"\n✓ 场景已是最新，无需下载")
+            else:
+                print(f"\n✓ 下载成功 ({downloaded} 个对象)")
+            return True
+            
+        except KeyboardInterrupt:
+            print(f"\n\n✗ 用户取消下载")
+            return False
+        except Exception as e:
+            print(f"\n✗ 下载失败: {e}")
+            return False
+    
+    def _is_local_copy_current(self, obj, prefix: str, target_scene_path: Path,
+                               existing_sizes: dict) -> bool:
+        """
+        判断本地文件是否与BOS对象一致
+        
+        先比较大小；大小一致且对象ETag为MD5时，再比较本地文件MD5
+        """
+        relative_path = obj.key[len(prefix):]
+        if existing_sizes.get(relative_path) != obj.size:
+            return False
+        
+        if not self._needs_content_check(obj):
+            return True
+        
+        etag = obj.etag.strip('"').lower()
+        return _file_md5(target_scene_path / relative_path) == etag
+    
+    def _needs_content_check(self, obj) -> bool:
+        """大小一致后是否还需比较MD5：开启 verify_existing 且对象ETag为MD5（分片上传的对象只能按大小判断）"""
+        if not self.verify_existing:
+            return False
+        etag = (getattr(obj, 'etag', None) or '').strip('"').lower()
+        return bool(_MD5_ETAG.match(etag))
+    
+    @staticmethod
+    def _scan_local_sizes(root: Path) -> dict:
+        """
+        遍历本地目录，返回 {相对路径(正斜杠): 文件大小}
+        
+        使用 os.scandir，目录项自带的元数据可直接复用（Windows下无需额外stat）
+        """
+        sizes = {}
+        stack = [(str(root), '')]
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        rel_path = f"{rel_dir}{entry.name}"
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, rel_path + '/'))
+                        elif entry.is_file(follow_symlinks=False):
+                            sizes[rel_path] = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+        return sizes
 
 def main():
     """主函数"""
@@ -4,8 +4,6 @@ import os
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from ..assets import SceneRegistry, calculate_directory_hash
 from .bos_manager import BosManager
 
@@ -244,7 +242,7 @@ def upload_scene_to_bos(scene_name: str,
     return True
 
 
-def main():
+def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="从配置文件批量上传已烘焙场景到BOS",
         epilog="""
@@ -269,7 +267,18 @@ def main():
                        help="仅模拟运行，不实际上传")
     parser.add_argument("--scene", help="仅上传指定场景（可选）")
     
-    args = parser.parse_args()
+    return parser
+
+
+def main(args: argparse.Namespace | None = None):
+    """
+    批量上传入口
+    
+    Args:
+        args: 参数对象；为None时从命令行解析（其他模块可直接传入，无需修改 sys.argv）
+    """
+    if args is None:
+        args = build_arg_parser().parse_args()
     
     print("\n" + "=" * 60)
     print("批量上传已烘焙场景到BOS")
@@ -0,0 +1,79 @@
+"""
+BOS存储操作共用的配置加载
+- 同一配置文件在进程内只读取、解析一次
+- 下载操作配置预解析为 dataclass
+- bcecmd cp 并发参数
+"""
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+# bcecmd cp 默认并发：文件级线程数 / 单个大文件分块线程数
+BCECMD_THREAD_NUM = 16
+BCECMD_MULTIPART_THREAD_NUM = 8
+
+
+@lru_cache(maxsize=16)
+def _read_json(resolved_path: str) -> dict:
+    with open(resolved_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_json_config(config_path: str) -> dict:
+    """
+    加载JSON配置文件（按绝对路径缓存）
+    
+    Returns:
+        配置字典的浅拷贝，调用方修改顶层键不会影响缓存
+    
+    Raises:
+        OSError / json.JSONDecodeError: 文件不存在或格式错误
+    """
+    return dict(_read_json(str(Path(config_path).resolve())))
+
+
+def bcecmd_parallel_args(thread_num: Optional[int] = BCECMD_THREAD_NUM,
+                         multipart_thread_num: Optional[int] = BCECMD_MULTIPART_THREAD_NUM) -> List[str]:
+    """
+    生成 bcecmd bos cp 的并发参数
+    
+    配置为 0 / null 时不传对应参数（使用 bcecmd 默认值，兼容不支持该参数的旧版本）
+    """
+    args = []
+    if thread_num:
+        args += ['--thread-num', str(int(thread_num))]
+    if multipart_thread_num:
+        args += ['--multipart-thread-num', str(int(multipart_thread_num))]
+    return args
+
+
+@dataclass(frozen=True)
+class DownloadOpConfig:
+    """场景下载配置"""
+    source_bucket: str = 'world-data'
+    source_prefix: str = 'raw'
+    local_content_path: Optional[str] = None
+    ue_config_path: Optional[str] = None
+    scenes: tuple = ()
+    skip_existing: bool = True
+    verify_existing: bool = True
+    thread_num: Optional[int] = BCECMD_THREAD_NUM
+    multipart_thread_num: Optional[int] = BCECMD_MULTIPART_THREAD_NUM
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DownloadOpConfig":
+        cfg = data or {}
+        return cls(
+            source_bucket=cfg.get('source_bucket') or cls.source_bucket,
+            source_prefix=(cfg.get('source_prefix') or cls.source_prefix).strip('/'),
+            local_content_path=cfg.get('local_content_path') or None,
+            ue_config_path=cfg.get('ue_config_path') or None,
+            scenes=tuple(cfg.get('scenes') or ()),
+            skip_existing=bool(cfg.get('skip_existing', cls.skip_existing)),
+            verify_existing=bool(cfg.get('verify_existing', cls.verify_existing)),
+            thread_num=cfg.get('thread_num', cls.thread_num),
+            multipart_thread_num=cfg.get('multipart_thread_num', cls.multipart_thread_num),
+        )
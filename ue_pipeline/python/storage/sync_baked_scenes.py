@@ -3,20 +3,47 @@
 扫描 BOS baked/ 目录，将找到的场景添加到数据库并标记为已烘焙
 """
 
+import queue
+import re
 import subprocess
-import json
-import sys
-from pathlib import Path
+import threading
+from collections import deque
 
-# 添加路径以便导入 scene_registry
-sys.path.insert(0, str(Path(__file__).parent / 'python'))
+from ..assets import SceneRegistry
+from .bos_client import get_bos_manager, initialize_bos
 
-from scene_registry import SceneRegistry
+# 写库批大小（bcecmd 输出也按此大小分页）
+DB_BATCH_SIZE = 500
+
+# bcecmd ls 的目录行，目录以 / 结尾，取最后一段作为场景名
+# 例如: "PRE  Seaside_Town/" 或 "baked/Seaside_Town/"；跳过 "Total ..." 和 "bos://..." 行
+_BOS_DIR_RE = re.compile(r'^(?!\s*(?:Total|bos://))(?:.*[\s/])?([^\s/]+)/\s*$')
+
+
+def iter_bos_scene_pages(bucket: str, prefix: str = "baked/"):
+    """
+    逐页产出 BOS 中的场景名称（仅扫描一级目录）
+    
+    BOS SDK 可用时直接读取 CommonPrefixes，否则回退到 bcecmd ls。
+    出错时打印错误并结束迭代。
+    
+    Args:
+        bucket: BOS bucket 名称
+        prefix: 前缀路径，默认 "baked/"
+    
+    Yields:
+        场景名称列表（一页）
+    """
+    bos = get_bos_manager()
+    if bos.is_available:
+        yield from _iter_bos_scenes_sdk(bos, bucket, prefix)
+    else:
+        yield from _iter_bos_scenes_bcecmd(bucket, prefix)
 
 
 def list_bos_scenes(bucket: str, prefix: str = "baked/") -> list:
     """
-    使用 bcecmd 列出 BOS 中的场景（仅扫描一级目录）
+    列出 BOS 中的场景（仅扫描一级目录）
     
     Args:
         bucket: BOS bucket 名称
@@ -27,61 +54,80 @@ def list_bos_scenes(bucket: str, prefix: str = "baked/") -> list:
     """
     print(f"正在扫描 BOS: bos://{bucket}/{prefix}")
     
+    scenes = set()
+    for page in iter_bos_scene_pages(bucket, prefix):
+        scenes.update(page)
+    return sorted(scenes)
+
+
+def _iter_bos_scenes_sdk(bos, bucket: str, prefix: str):
+    """使用 BOS SDK 逐页列出场景（delimiter='/' 直接得到一级目录）"""
+    try:
+        for prefixes in bos.iter_prefix_pages(bucket, prefix):
+            yield [name for name in (p.rstrip('/').split('/')[-1] for p in prefixes) if name]
+    except Exception as e:
+        print(f"✗ 扫描 BOS 失败: {e}")
+
+
+def _iter_bos_scenes_bcecmd(bucket: str, prefix: str):
+    """使用 bcecmd 列出场景，按 DB_BATCH_SIZE 分页产出"""
+    proc = None
     try:
         # 使用 bcecmd 列出目录
         bos_path = f"bos://{bucket}/{prefix}"
         cmd = ['bcecmd', 'bos', 'ls', bos_path]
         
-        result = subprocess.run(
+        # 逐行读取输出，不在内存中缓冲完整列表（stderr 合并进来，避免管道阻塞）
+        proc = subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
             encoding='utf-8',
             errors='ignore'
         )
         
-        if result.returncode != 0:
-            print(f"✗ 列出 BOS 文件失败")
-            print(f"  错误: {result.stderr}")
-            return []
-        
         # 解析输出，提取场景名称（一级目录）
-        scenes = set()
-        lines = result.stdout.strip().split('\n')
+        page = []
+        add_scene = page.append
+        tail = deque(maxlen=5)  # 保留最后几行用于报错
         
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('Total') or line.startswith('bos://'):
-                continue
-            
-            # bcecmd ls 输出格式: 目录通常以 / 结尾
-            # 例如: PRE  Seaside_Town/ 或 baked/Seaside_Town/
-            # 提取最后一个路径部分
-            if line.endswith('/'):
-                # 移除末尾的 /
-                path = line.rstrip('/')
-                # 只取最后一段作为场景名
-                scene_name = path.split('/')[-1]
-                # 去除可能的前缀（如 "PRE  "）
-                scene_name = scene_name.split()[-1] if scene_name else ''
-                if scene_name:
-                    scenes.add(scene_name)
+        for line in proc.stdout:
+            tail.append(line)
+            m = _BOS_DIR_RE.match(line)
+            if m:
+                add_scene(m.group(1))
+                if len(page) >= DB_BATCH_SIZE:
+                    yield page
+                    page = []
+                    add_scene = page.append
+        
+        if proc.wait() != 0:
+            print(f"✗ 列出 BOS 文件失败")
+            print(f"  错误: {' | '.join(l.strip() for l in tail if l.strip())}")
+            return
         
-        return sorted(list(scenes))
+        if page:
+            yield page
         
     except FileNotFoundError:
         print("✗ 未找到 bcecmd 命令")
         print("  请确保已安装 bcecmd 并配置在 PATH 中")
-        return []
     except Exception as e:
         print(f"✗ 扫描 BOS 失败: {e}")
-        return []
+    finally:
+        # 调用方提前停止迭代时结束子进程
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+            proc.wait()
 
 
 def sync_baked_scenes_to_db(bucket: str = "world-data", prefix: str = "baked/", db_path: str = "database/scene_registry.db"):
     """
     同步 BOS 中的 baked 场景到数据库
     
+    列表在后台线程中逐页获取，主线程同时按批写库，扫描和写库互相重叠。
+    
     Args:
         bucket: BOS bucket 名称
         prefix: BOS 前缀路径，默认 "baked/"
@@ -91,55 +137,66 @@ def sync_baked_scenes_to_db(bucket: str = "world-data", prefix: str = "baked/",
     print("同步 BOS 已烘焙场景到数据库")
     print("=" * 60)
     
-    # 连接数据库
-    registry = SceneRegistry(db_path)
+    # 连接数据库（复用进程内已打开的注册表）
+    registry = SceneRegistry.instance(db_path)
     
-    # 扫描 BOS
-    scenes = list_bos_scenes(bucket, prefix)
+    # 扫描 BOS（后台线程），每页放入队列
+    print(f"正在扫描 BOS: bos://{bucket}/{prefix}")
+    print(f"正在更新数据库: {db_path}")
     
-    if not scenes:
-        print("\n✗ 未在 BOS 中找到任何场景")
-        print("  请检查:")
-        print("  1. bcecmd 是否已登录")
-        print("  2. BOS bucket 中是否有 baked/ 目录")
-        return
+    pages = queue.Queue(maxsize=8)
     
-    print(f"\n找到 {len(scenes)} 个已烘焙场景:")
-    for scene in scenes:
-        print(f"  - {scene}")
+    def produce_pages():
+        try:
+            for page in iter_bos_scene_pages(bucket, prefix):
+                pages.put(page)
+        finally:
+            pages.put(None)  # 结束标记
     
-    # 更新数据库
-    print(f"\n正在更新数据库: {db_path}")
+    producer = threading.Thread(target=produce_pages, daemon=True)
+    producer.start()
     
     added_count = 0
     updated_count = 0
-    
-    for scene_name in scenes:
-        # 检查场景是否已存在
-        existing_scene = registry.get_scene(scene_name)
-        
-        # BOS 路径（已烘焙）
-        bos_baked_path = f"bos://{bucket}/{prefix}{scene_name}/"
+    seen = set()
+    rows = []
+    
+    # 已有场景一次查出，循环内在内存中判断新增/更新
+    existing_scenes = registry.get_scene_names()
+    
+    # 所有写入在同一个事务中完成，只提交（fsync）一次；每满一批执行一次 executemany
+    with registry.transaction(fast_bulk=True):
+        while (page := pages.get()) is not None:
+            for scene_name in page:
+                if scene_name in seen:
+                    continue
+                seen.add(scene_name)
+                
+                # BOS 路径（已烘焙）
+                rows.append((scene_name, f"bos://{bucket}/{prefix}{scene_name}/"))
+                
+                if scene_name not in existing_scenes:
+                    print(f"  ✓ 添加场景: {scene_name}")
+                    added_count += 1
+                else:
+                    print(f"  ✓ 更新场景: {scene_name} -> BOS 存在")
+                    updated_count += 1
+            
+            if len(rows) >= DB_BATCH_SIZE:
+                registry.add_baked_scenes(rows)
+                rows = []
         
-        if existing_scene is None:
-            # 添加新场景
-            registry.add_scene(
-                scene_name=scene_name,
-                bos_baked_path=bos_baked_path,
-                content_hash="",  # 从 BOS 同步的场景暂时没有 hash
-                bos_exists=True
-            )
-            print(f"  ✓ 添加场景: {scene_name}")
-            added_count += 1
-        else:
-            # 更新现有场景的 BOS 状态
-            registry.add_scene(
-                scene_name=scene_name,
-                bos_baked_path=bos_baked_path,
-                bos_exists=True
-            )
-            print(f"  ✓ 更新场景: {scene_name} -> BOS 存在")
-            updated_count += 1
+        if rows:
+            registry.add_baked_scenes(rows)
+    
+    producer.join()
+    
+    if not seen:
+        print("\n✗ 未在 BOS 中找到任何场景")
+        print("  请检查:")
+        print("  1. BOS 凭证是否已配置（或 bcecmd 是否已登录）")
+        print("  2. BOS bucket 中是否有 baked/ 目录")
+        return
     
     # 打印统计信息
     print("\n" + "=" * 60)
@@ -147,7 +204,7 @@ def sync_baked_scenes_to_db(bucket: str = "world-data", prefix: str = "baked/",
     print("=" * 60)
     print(f"新增场景: {added_count}")
     print(f"更新场景: {updated_count}")
-    print(f"总计: {len(scenes)} 个场景")
+    print(f"总计: {len(seen)} 个场景")
     
     # 显示数据库统计
     print("\n数据库统计:")
@@ -167,10 +224,10 @@ def main():
         epilog="""
 示例:
   # 使用默认配置
-  python sync_baked_scenes.py
+  python -m ue_pipeline.python.storage.sync_baked_scenes
   
   # 指定 bucket 和数据库路径
-  python sync_baked_scenes.py --bucket my-bucket --db scenes/my_registry.db
+  python -m ue_pipeline.python.storage.sync_baked_scenes --bucket my-bucket --db scenes/my_registry.db
         """
     )
     
@@ -183,6 +240,12 @@ def main():
     
     args = parser.parse_args()
     
+    try:
+        initialize_bos()
+    except ImportError as e:
+        # 未安装SDK时回退到 bcecmd
+        print(f"⚠ BOS SDK 初始化失败: {e}")
+    
     sync_baked_scenes_to_db(bucket=args.bucket, db_path=args.db)
 
 
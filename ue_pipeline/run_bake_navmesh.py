@@ -5,6 +5,9 @@ import json
 import os
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
 
 
@@ -15,9 +18,156 @@ if str(repo_root) not in sys.path:
 
 from ue_pipeline.python.core import logger
 from ue_pipeline.python.core import job_utils
+from ue_pipeline.python.navmesh.bake_cache import (
+    BAKE_CACHE_RELDIR, merge_mesh_count_shards, remove_mesh_count_shards,
+    SCENES_DB_DIR, sync_scenes_json_low_actor,
+)
 
 
-def run_ue_job(ue_editor: str, project: str, merged_manifest: dict, worker_phase1: str, worker_phase2: str, job_id: str, full_config: dict) -> int:
+def build_phase1_args(ue_editor: str, abs_project: str, abs_worker_phase1: str, log_file: str) -> list:
+    return [
+        ue_editor,
+        abs_project,
+        f'-ExecutePythonScript={abs_worker_phase1}',
+        '-RenderOffscreen',
+        '-ResX=1920',
+        '-ResY=1080',
+        '-ForceRes',
+        '-Windowed',
+        '-NoLoadingScreen',
+        '-NoScreenMessages',
+        '-NoSplash',
+        '-Unattended',
+        '-NoSound',
+        '-AllowStdOutLogVerbosity',
+        '-log',
+        '-FullStdOutLogOutput',
+        f'LOG={log_file}',
+    ]
+
+
+def run_phase1_process(ue_args: list, log_file: str, env: dict = None) -> int:
+    """Run one Phase 1 UE process and check its log for map loading errors."""
+    result = subprocess.run(ue_args, check=False, env=env)
+    if result.returncode != 0:
+        return result.returncode
+    
+    # 额外检查：即使退出码是0，也检查是否有"Map file does not exist"等关键错误
+    if os.path.exists(log_file):
+        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+            log_content = f.read()
+            if 'Map file does not exist' in log_content or 'Failed to load map' in log_content:
+                logger.error(f"Phase 1 detected map loading errors in log: {log_file}")
+                return 1
+    return 0
+
+
+def check_phase1_result(result_path: str) -> int:
+    """Fail Phase 1 on the worker's result JSON: quit_editor exits 0 even when maps failed."""
+    try:
+        result = job_utils.read_json_file(result_path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Phase 1 wrote no readable result file {result_path}: {e}")
+        return 1
+    if result.get("failed", 0) > 0:
+        logger.error(f"Phase 1 failed for {result['failed']} map(s) ({result_path})")
+        for failed in result.get("failed_maps", []):
+            logger.plain(f"  - {failed['map']}: {failed['error']}")
+        return 1
+    return 0
+
+
+def run_phase1_sharded(ue_editor: str, abs_project: str, abs_worker_phase1: str, job_id: str, workers: int,
+                       result_path: str) -> int:
+    """
+    Split the map list across `workers` UE processes running in parallel.
+    
+    Each process gets UE_NAVMESH_SHARD=i/k and bakes maps[i::k]; the per-shard
+    result files are merged into result_path, and the per-shard mesh count caches
+    into the project's mesh_counts.json. A shard that leaves no result file fails.
+    """
+    bake_cache_dir = Path(abs_project).parent / BAKE_CACHE_RELDIR
+    remove_mesh_count_shards(bake_cache_dir, workers)
+    
+    shard_jobs = []
+    for shard_index in range(workers):
+        log_file = f'NavMeshBake_Phase1_{job_id}_Shard{shard_index}.txt'
+        env = os.environ.copy()
+        env['UE_NAVMESH_SHARD'] = f'{shard_index}/{workers}'
+        # Absolute: the editor's cwd is the engine Binaries dir, not the launcher's
+        env['UE_NAVMESH_RESULT'] = os.path.abspath(f'NavMeshBake_Phase1_{job_id}_Shard{shard_index}.result.json')
+        ue_args = build_phase1_args(ue_editor, abs_project, abs_worker_phase1, log_file)
+        logger.info(f"Shard {shard_index}/{workers} command: {' '.join(ue_args)}")
+        shard_jobs.append((shard_index, ue_args, log_file, env))
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_phase1_process, ue_args, log_file, env): shard_index
+            for shard_index, ue_args, log_file, env in shard_jobs
+        }
+        exit_codes = {}
+        for future in as_completed(futures):
+            shard_index = futures[future]
+            try:
+                exit_codes[shard_index] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to launch UE Phase 1 shard {shard_index}: {e}")
+                exit_codes[shard_index] = 1
+    
+    merged = {"job_id": job_id, "total": 0, "success": 0, "skipped": 0, "failed": 0,
+              "failed_maps": [], "skipped_maps": [], "low_actor": {}}
+    for shard_index, _, _, env in shard_jobs:
+        shard_result_path = env['UE_NAVMESH_RESULT']
+        if not os.path.exists(shard_result_path):
+            logger.error(f"Phase 1 shard {shard_index} wrote no result file: {shard_result_path}")
+            exit_codes[shard_index] = exit_codes.get(shard_index) or 1
+            continue
+        shard_result = job_utils.read_json_file(shard_result_path)
+        for key in ("total", "success", "skipped", "failed"):
+            merged[key] += shard_result.get(key, 0)
+        merged["failed_maps"].extend(shard_result.get("failed_maps", []))
+        merged["skipped_maps"].extend(shard_result.get("skipped_maps", []))
+        merged["low_actor"].update(shard_result.get("low_actor", {}))
+        os.remove(shard_result_path)
+    job_utils.write_json_file(result_path, merged)
+    # Every shard has exited, so this is the only writer of mesh_counts.json and scenes.json
+    merge_mesh_count_shards(bake_cache_dir, workers)
+    try:
+        sync_scenes_json_low_actor(SCENES_DB_DIR / 'scenes.json', merged["low_actor"],
+                                   datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    except Exception as e:
+        logger.warning(f"Failed to update scenes.json: {e}")
+    
+    logger.blank(1)
+    logger.separator(width=40, char='-')
+    for shard_index in sorted(exit_codes):
+        if exit_codes[shard_index] != 0:
+            logger.error(f"Phase 1 shard {shard_index} failed with exit code: {exit_codes[shard_index]}")
+    logger.info(f"Phase 1 result: {merged['success']} succeeded, {merged['skipped']} skipped, "
+                f"{merged['failed']} failed ({result_path})")
+    if merged["failed_maps"]:
+        logger.info("Failed maps details:")
+        for failed in merged["failed_maps"]:
+            logger.plain(f"  - {failed['map']}: {failed['error']}")
+    
+    exit_code = next((code for _, code in sorted(exit_codes.items()) if code != 0), 0)
+    if exit_code == 0 and merged["failed"] > 0:
+        # Each editor exits 0 via quit_editor even when its maps failed
+        logger.error(f"Phase 1 failed for {merged['failed']} map(s)")
+        exit_code = 1
+    return exit_code
+
+
+def load_phase1_skipped_maps(result_path: str) -> set:
+    """Maps Phase 1 skipped as unchanged since their last verified bake; Phase 2 has nothing to rebuild."""
+    try:
+        return set(job_utils.read_json_file(result_path).get("skipped_maps", []))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read Phase 1 result {result_path}, running Phase 2 for every map: {e}")
+        return set()
+
+
+def run_ue_job(ue_editor: str, project: str, merged_manifest: dict, worker_phase1: str, worker_phase2: str, job_id: str, full_config: dict, workers: int = 1) -> int:
     abs_worker_phase1 = os.path.abspath(worker_phase1)
     abs_worker_phase2 = os.path.abspath(worker_phase2)
     
@@ -25,19 +175,23 @@ def run_ue_job(ue_editor: str, project: str, merged_manifest: dict, worker_phase
     manifest = merged_manifest.copy()
     manifest['ue_config'] = full_config
     
-    import tempfile
     temp_manifest_fd, temp_manifest_path = tempfile.mkstemp(suffix='.json', prefix='navmesh_manifest_')
     try:
         with os.fdopen(temp_manifest_fd, 'w', encoding='utf-8') as f:
             json.dump(manifest, f, indent=2)
         
         os.environ['UE_NAVMESH_MANIFEST'] = temp_manifest_path
+        # Keep the worker's result JSON next to the Phase 1 log instead of the temp manifest
+        # Absolute: the editor's cwd is the engine Binaries dir, not the launcher's
+        phase1_result_path = os.path.abspath(f'NavMeshBake_Phase1_{job_id}.result.json')
+        os.environ['UE_NAVMESH_RESULT'] = phase1_result_path
         
         abs_project = os.path.abspath(project)
         
         # Get maps list for Phase 2
         navmesh_config = manifest.get('navmesh_config', {})
         maps = navmesh_config.get('maps', [])
+        workers = max(1, min(workers, len(maps)))
         
         # ============================================================
         # PHASE 1: Add NavMeshBoundsVolume and save maps
@@ -46,56 +200,42 @@ def run_ue_job(ue_editor: str, project: str, merged_manifest: dict, worker_phase
         logger.info("PHASE 1: Adding NavMeshBoundsVolume to maps")
         logger.info("=" * 60)
         
-        ue_args_phase1 = [
-            ue_editor,
-            abs_project,
-            f'-ExecutePythonScript={abs_worker_phase1}',
-            '-RenderOffscreen',
-            '-ResX=1920',
-            '-ResY=1080',
-            '-ForceRes',
-            '-Windowed',
-            '-NoLoadingScreen',
-            '-NoScreenMessages',
-            '-NoSplash',
-            '-Unattended',
-            '-NoSound',
-            '-AllowStdOutLogVerbosity',
-            '-log',
-            '-FullStdOutLogOutput',
-            f'LOG=NavMeshBake_Phase1_{job_id}.txt',
-        ]
-        
-        logger.info(f"Command: {' '.join(ue_args_phase1)}")
-        logger.blank(1)
-        logger.separator(width=40, char='-')
-        
-        try:
-            result_phase1 = subprocess.run(ue_args_phase1, check=False)
-
-            logger.blank(1)
-            logger.separator(width=40, char='-')
+        if workers > 1:
+            logger.info(f"Running Phase 1 in {workers} parallel UE processes")
+            phase1_code = run_phase1_sharded(ue_editor, abs_project, abs_worker_phase1, job_id, workers,
+                                             phase1_result_path)
+            if phase1_code != 0:
+                logger.error("Aborting - Phase 1 failed")
+                return phase1_code
             
-            if result_phase1.returncode != 0:
-                logger.error(f"Phase 1 failed with exit code: {result_phase1.returncode}")
-                return result_phase1.returncode
-            
-            # 额外检查：即使退出码是0，也检查是否有"Map file does not exist"等关键错误
+            logger.info("Phase 1 completed - NavMeshBoundsVolume added and saved")
+            logger.blank(1)
+        else:
             log_file = f'NavMeshBake_Phase1_{job_id}.txt'
-            if os.path.exists(log_file):
-                with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    log_content = f.read()
-                    if 'Map file does not exist' in log_content or 'Failed to load map' in log_content:
-                        logger.error("Phase 1 detected map loading errors in log")
-                        logger.error("Aborting - map file not found")
-                        return 1
+            ue_args_phase1 = build_phase1_args(ue_editor, abs_project, abs_worker_phase1, log_file)
             
-            logger.info("Phase 1 completed - NavMeshBoundsVolume added and saved")
+            logger.info(f"Command: {' '.join(ue_args_phase1)}")
             logger.blank(1)
+            logger.separator(width=40, char='-')
             
-        except Exception as e:
-            logger.error(f"Failed to launch UE Phase 1: {e}")
-            return 1
+            try:
+                phase1_code = run_phase1_process(ue_args_phase1, log_file)
+                if phase1_code == 0:
+                    phase1_code = check_phase1_result(phase1_result_path)
+
+                logger.blank(1)
+                logger.separator(width=40, char='-')
+                
+                if phase1_code != 0:
+                    logger.error(f"Phase 1 failed with exit code: {phase1_code}")
+                    return phase1_code
+                
+                logger.info("Phase 1 completed - NavMeshBoundsVolume added and saved")
+                logger.blank(1)
+                
+            except Exception as e:
+                logger.error(f"Failed to launch UE Phase 1: {e}")
+                return 1
         
         # ============================================================
         # PHASE 2: Reload each map with cmd to trigger NavMesh build
@@ -104,8 +244,13 @@ def run_ue_job(ue_editor: str, project: str, merged_manifest: dict, worker_phase
         logger.info("PHASE 2: Triggering NavMesh build by reloading maps")
         logger.info("=" * 60)
         
-        for i, map_path in enumerate(maps, 1):
-            logger.info(f"[{i}/{len(maps)}] Reloading map to trigger build and verify: {map_path}")
+        skipped_maps = load_phase1_skipped_maps(phase1_result_path)
+        phase2_maps = [m for m in maps if m not in skipped_maps]
+        if skipped_maps:
+            logger.info(f"Skipping {len(maps) - len(phase2_maps)} map(s) unchanged since their last bake")
+        
+        for i, map_path in enumerate(phase2_maps, 1):
+            logger.info(f"[{i}/{len(phase2_maps)}] Reloading map to trigger build and verify: {map_path}")
             
             # Set environment variable for worker to know which map to verify
             os.environ['UE_VERIFY_MAP_PATH'] = map_path
@@ -174,6 +319,12 @@ def main():
         'manifest_path',
         help='Path to the navmesh bake manifest JSON file'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of UE processes to run Phase 1 in parallel, each baking a shard of the maps (default: 1)'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -211,6 +362,7 @@ def main():
     logger.kv("Max Scale:", str(max_scale))
     logger.kv("Job ID:", job_id)
     logger.kv("Maps:", str(len(maps)))
+    logger.kv("Workers:", str(args.workers))
     logger.kv("UE Editor:", ue_editor)
     logger.kv("Project:", project)
     logger.blank(1)
@@ -220,7 +372,7 @@ def main():
     logger.info("Starting NavMesh bake job...")
     logger.blank(1)
     
-    exit_code = run_ue_job(ue_editor, project, manifest, worker_phase1, worker_phase2, job_id, full_config)
+    exit_code = run_ue_job(ue_editor, project, manifest, worker_phase1, worker_phase2, job_id, full_config, args.workers)
     sys.exit(exit_code)
 
 